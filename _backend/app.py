@@ -1,38 +1,70 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, g, request, jsonify, send_file, stream_with_context
 from flask_cors import CORS
-import fitz  # PyMuPDF for extracting text from PDFs
-from parsing import tokenize_resume
-from calculate_similarity_score import analyze_resume
+from parsing import json_sink, parse_text
+from calculate_similarity_score import JobProfile, analyze_resume
+import heapq
 import json
 import os
-import shutil
+from contextlib import ExitStack
 from werkzeug.utils import secure_filename
 from authenticity_checker import ResumeAuthenticityChecker
+from pdf_extraction import PdfTooLargeError, spooled_pdf
+from worker_pool import parse_pdfs
+from resume_store import new_batch_id, resume_store
+from skill_index import get_skill_index
+from ingest_jobs import fail_interrupted_jobs, ingest_queue, job_status
+from validation import PARSED_RESUME_PATH
+from parse_cache import parse_cache
+import metrics
+import time
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
-def extract_text_from_pdf(pdf_file):
-    """Extract text from a PDF file."""
-    pdf_document = fitz.open(stream=pdf_file.read(), filetype="pdf")  # Open PDF from memory
-    text = ""
-    for page in pdf_document:
-        text += page.get_text("text") + "\n"  # Extract text from each page
-    return text.strip()
+# One checker per process so every request shares the company verdict cache
+authenticity_checker = ResumeAuthenticityChecker()
+
+metrics.REGISTRY.callback(
+    "resume_parse_cache_lookups_total", "Parse cache lookups by outcome.", "counter", ["outcome"],
+    lambda: {(outcome,): count for outcome, count in parse_cache.stats().items() if outcome != "entries"},
+)
+
+@app.before_request
+def start_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request(response):
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    metrics.HTTP_SECONDS.observe(time.perf_counter() - g.get("request_started", time.perf_counter()), endpoint=endpoint)
+    metrics.HTTP_REQUESTS.inc(endpoint=endpoint, status=response.status_code)
+    return response
+
+@app.route("/metrics", methods=["GET"])
+def get_metrics():
+    """Prometheus-style text exposition of per-stage latencies, sizes and request counts."""
+    return Response(metrics.REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+@app.errorhandler(PdfTooLargeError)
+def pdf_too_large(error):
+    return jsonify({"error": str(error)}), 413
 
 @app.route("/submit", methods=["POST"])
 def submit():
     if "pdfFile" in request.files:  # If a file is submitted
         pdf_file = request.files["pdfFile"]
         if pdf_file.filename != "":
-            extracted_text = extract_text_from_pdf(pdf_file)
-            tokenize_resume(extracted_text, None)
-            return jsonify({"message": "PDF processed successfully", "extractedText": extracted_text})
+            with spooled_pdf(pdf_file) as spooled:
+                [(extracted_text, parsed_resume)] = parse_pdfs([spooled], [json_sink(PARSED_RESUME_PATH)],
+                                                               workers=1, save_tokens=True)
+            return jsonify({"message": "PDF processed successfully", "extractedText": extracted_text,
+                            "parsedResume": parsed_resume})
 
     elif request.json and "resumeText" in request.json:  # If text is submitted
         resume_text = request.json["resumeText"]
-        tokenize_resume(resume_text, None)
-        return jsonify({"message": "Text received successfully", "resumeText": resume_text})
+        parsed_resume = parse_text(resume_text, [json_sink(PARSED_RESUME_PATH)], save_tokens=True)
+        return jsonify({"message": "Text received successfully", "resumeText": resume_text,
+                        "parsedResume": parsed_resume})
 
     return jsonify({"error": "No valid data received"}), 400
 
@@ -40,8 +72,7 @@ def submit():
 def get_parsed_resume():
     """Serve the parsed JSON resume."""
     try:
-        full_path = r"F:\React JS\ai_resume_parsing_system\_backend\resume_parsed_data.json"
-        with open(full_path, "r", encoding="utf-8") as file:
+        with open(PARSED_RESUME_PATH, "r", encoding="utf-8") as file:
             data = json.load(file)
         return jsonify(data)
     except FileNotFoundError:
@@ -63,9 +94,11 @@ def compare_resume():
         return jsonify({"error": "Job description is required"}), 400
 
     try:
-        # Load parsed resume data
-        with open("resume_parsed_data.json", "r", encoding="utf-8") as file:
-            parsed_resume = json.load(file)
+        # Use the parsed resume sent with the request, falling back to the last saved one
+        parsed_resume = data.get("parsedResume")
+        if parsed_resume is None:
+            with open("resume_parsed_data.json", "r", encoding="utf-8") as file:
+                parsed_resume = json.load(file)
 
         job_description = data["jobDescription"]
 
@@ -87,96 +120,238 @@ def compare_resume():
         print(e)
         return jsonify({"error": str(e)}), 500
     
-PARSED_FOLDER = 'parsed'
 @app.route('/upload-resumes', methods=['POST'])
 def upload_resumes():
-    # Clear parsed folder
-    if os.path.exists(PARSED_FOLDER):
-        shutil.rmtree(PARSED_FOLDER)
-    os.makedirs(PARSED_FOLDER, exist_ok=True)
-
     files = request.files
     if not files:
         return "No files uploaded", 400
     count = 0
+    spooled_uploads = []
+    filenames = []
+    with ExitStack() as spooled_files:
+        for key in files:
+            file = files[key]
+            filename = secure_filename(file.filename)
+            file_ext = os.path.splitext(filename)[1].lower()
+
+            if file_ext not in ['.pdf']:
+                return f"Unsupported file type: {file_ext}", 400
+
+            # Copy the upload out of the request so a worker process can read it
+            spooled_uploads.append(spooled_files.enter_context(spooled_pdf(file)))
+            count += 1
+            filenames.append(filename.rsplit('.', 1)[0] + f'_{count}_parsed.json')
+
+        # Extract and parse the whole batch across the worker pool
+        results = parse_pdfs(spooled_uploads)
+
+    # Store the batch; ranking reads the latest batch unless told otherwise
+    batch_id = new_batch_id()
+    parsed_resumes = [parsed for _, parsed in results]
+    resume_ids = resume_store.insert_batch(batch_id, list(zip(filenames, parsed_resumes)))
+
+    skill_index = get_skill_index()
+    for resume_id, filename, parsed in zip(resume_ids, filenames, parsed_resumes):
+        skill_index.add(resume_id, parsed.get("skills") or [], filename)
+
+    return jsonify({"message": "Parsed data stored successfully.", "batchId": batch_id}), 200
+
+@app.route('/upload-resumes/async', methods=['POST'])
+def upload_resumes_async():
+    """Accepts a batch for background ingestion and returns a job id to poll."""
+    files = request.files
+    if not files:
+        return "No files uploaded", 400
+
+    uploads = []
     for key in files:
         file = files[key]
         filename = secure_filename(file.filename)
         file_ext = os.path.splitext(filename)[1].lower()
-
         if file_ext not in ['.pdf']:
             return f"Unsupported file type: {file_ext}", 400
-
-        # Convert PDF (or other) file-like to text
-        text = extract_text_from_pdf(file)
-        count += 1
-        # Construct path where parsed JSON will be saved
-        parsed_filename = filename.rsplit('.', 1)[0] + f'_{count}_parsed.json'
-        print(parsed_filename)
-        parsed_path = os.path.join(PARSED_FOLDER, parsed_filename)
-
-        # Now call your parsing function with text and the target path
-        tokenize_resume(text, parsed_path)
-
-    return jsonify({"message": "Parsed data stored successfully."}), 200
+        uploads.append((filename.rsplit('.', 1)[0] + f'_{len(uploads) + 1}_parsed.json', file))
+
+    job_id = ingest_queue.submit(uploads)
+    return jsonify({"jobId": job_id, "statusUrl": f"/jobs/{job_id}"}), 202
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """Per-file progress, failures and stored resume ids of an ingestion job."""
+    job = job_status(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job), 200
+
+def _score_batch(job_profile, batch_id):
+    """Yields one comparison result per stored resume in the batch, as it is scored."""
+    for resume_id, filename, skills in resume_store.iter_resume_skills(batch_id):
+        result = job_profile.score_skills(set(skills))
+
+        yield {
+            "id": resume_id,
+            "filename": filename,
+            "matchedSkills": result["matchedSkills"],
+            "unmatchedSkills": result["unmatchedSkills"],
+            "similarityScore": float(result["similarityScore"])
+        }
 
 @app.route("/compare-multiple-resumes", methods=["POST"])
 def compare_multiple_resumes():
+    """
+    Scores a stored batch against the JD. Optional fields:
+    ``topK`` returns only the best k resumes, best first (bounded heap);
+    ``stream`` ("ndjson" or "sse") sends each result as soon as it is scored.
+    """
     data = request.json
 
     if not data or "jobDescription" not in data:
         return jsonify({"error": "Job description is required"}), 400
 
-    job_description = data["jobDescription"]
-    parsed_folder = "parsed"
-    results = []
+    stream = data.get("stream")
+    if stream not in (None, "ndjson", "sse"):
+        return jsonify({"error": "stream must be 'ndjson' or 'sse'"}), 400
+
+    # Extract and embed the JD's skills once for the whole pool
+    job_profile = JobProfile(data["jobDescription"])
+    batch_id = data.get("batchId") or resume_store.latest_batch_id()
+    results = _score_batch(job_profile, batch_id) if batch_id is not None else iter(())
+
+    if data.get("topK") is not None:
+        results = iter(heapq.nlargest(int(data["topK"]), results,
+                                      key=lambda result: (result["similarityScore"], -result["id"])))
+
+    if stream == "ndjson":
+        return Response(stream_with_context(json.dumps(result) + "\n" for result in results),
+                        mimetype="application/x-ndjson")
+    if stream == "sse":
+        return Response(stream_with_context(f"data: {json.dumps(result)}\n\n" for result in results),
+                        mimetype="text/event-stream")
+    return jsonify(list(results)), 200
+
+@app.route("/top-candidates", methods=["POST"])
+def top_candidates():
+    """
+    Ranks every stored resume against the JD, scoring only those that share a matching skill.
+    With ``"exact": true`` resumes are ranked by exact skill overlap instead.
+    """
+    data = request.json
 
-    # Loop through all .json files in the parsed folder
-    for filename in os.listdir(parsed_folder):
-        if filename.endswith(".json"):
-            filepath = os.path.join(parsed_folder, filename)
-            with open(filepath, "r", encoding="utf-8") as file:
-                parsed_resume = json.load(file)
+    if not data or "jobDescription" not in data:
+        return jsonify({"error": "Job description is required"}), 400
 
-            result = analyze_resume(parsed_resume, job_description)
+    job_profile = JobProfile(data["jobDescription"])
+    skill_index = get_skill_index()
+    skill_index.refresh()
 
+    results = []
+    if data.get("exact"):
+        # Exact skill overlap only, scored in bulk over the whole pool
+        job_skill_count = max(1, len(job_profile.skills))
+        for resume_id, filename, matched in skill_index.top_k_exact(job_profile, int(data.get("k", 10))):
             results.append({
+                "id": resume_id,
                 "filename": filename,
-                "matchedSkills": result["matchedSkills"],
-                "unmatchedSkills": result["unmatchedSkills"],
-                "similarityScore": float(result["similarityScore"])
+                "matchedSkills": matched,
+                "unmatchedSkills": [skill for skill in job_profile.skills if skill not in matched],
+                "similarityScore": round(len(matched) / job_skill_count * 100, 2)
             })
+        return jsonify(results), 200
+
+    for resume_id, filename, result in skill_index.top_k(job_profile, int(data.get("k", 10))):
+        results.append({
+            "id": resume_id,
+            "filename": filename,
+            "matchedSkills": result["matchedSkills"],
+            "unmatchedSkills": result["unmatchedSkills"],
+            "similarityScore": float(result["similarityScore"])
+        })
 
     return jsonify(results), 200
 
+@app.route("/resumes/<int:resume_id>", methods=["DELETE"])
+def delete_resume(resume_id):
+    if not resume_store.delete_resume(resume_id):
+        return jsonify({"error": "Resume not found"}), 404
+    get_skill_index().remove(resume_id)
+    return jsonify({"message": "Resume deleted."}), 200
+
 @app.route("/check-authenticity", methods=["POST"])
 def check_authenticity():
     if "resume" not in request.files:
         return jsonify({"error": "No resume file uploaded"}), 400
 
     resume_file = request.files["resume"]
-    text_data = extract_text_from_pdf(resume_file)
-    
-    # Save parsed tokens to JSON
-    current_dir = os.getcwd()
-    parsed_resume_path = os.path.join(current_dir, "_plag_checking.json")
-    tokenize_resume(text_data, parsed_resume_path)
 
-    # Read text data from the saved JSON
-    try:
-        with open(parsed_resume_path, "r", encoding="utf-8") as f:
-            parsed_resume_data = json.load(f)
-    except Exception as e:
-        return jsonify({"error": f"Failed to read parsed resume: {str(e)}"}), 500
+    # Parse in memory; nothing is written to disk
+    with spooled_pdf(resume_file) as spooled:
+        [(_, parsed_resume_data)] = parse_pdfs([spooled], workers=1)
 
-    # Initialize checker
-    obj_authenticity_checker = ResumeAuthenticityChecker()
-    
     # Call the checker with parsed data
-    result = obj_authenticity_checker.check_resume_authenticity(parsed_resume_data)
+    result = authenticity_checker.check_resume_authenticity(parsed_resume_data)
     print(result)
     # Return the actual result
     return jsonify(result), 200
 
+@app.route("/check-authenticity-batch", methods=["POST"])
+def check_authenticity_batch():
+    """
+    Checks every uploaded PDF: parsing runs across the worker pool, then the shared
+    checker scores the batch at once. Returns per-file results and aggregate timings.
+    """
+    files = request.files
+    if not files:
+        return jsonify({"error": "No resume files uploaded"}), 400
+
+    started = time.perf_counter()
+    filenames = []
+    results = []
+    with ExitStack() as spooled_files:
+        spooled_uploads = []
+        for key in files:
+            for file in files.getlist(key):
+                filename = secure_filename(file.filename)
+                file_ext = os.path.splitext(filename)[1].lower()
+                if file_ext not in ['.pdf']:
+                    return f"Unsupported file type: {file_ext}", 400
+                spooled_uploads.append(spooled_files.enter_context(spooled_pdf(file)))
+                filenames.append(filename)
+
+        try:
+            parsed = [parsed_resume for _, parsed_resume in parse_pdfs(spooled_uploads)]
+        except Exception:
+            # Retry one by one so a broken PDF only fails itself
+            parsed = []
+            for spooled in spooled_uploads:
+                try:
+                    [(_, parsed_resume)] = parse_pdfs([spooled])
+                    parsed.append(parsed_resume)
+                except Exception as e:
+                    parsed.append(e)
+    parsed_at = time.perf_counter()
+
+    checked = iter(authenticity_checker.check_resumes_authenticity(
+        [parsed_resume for parsed_resume in parsed if not isinstance(parsed_resume, Exception)]
+    ))
+    for filename, parsed_resume in zip(filenames, parsed):
+        if isinstance(parsed_resume, Exception):
+            results.append({"filename": filename, "error": str(parsed_resume)})
+        else:
+            results.append({"filename": filename, "result": next(checked)})
+    finished = time.perf_counter()
+
+    return jsonify({
+        "results": results,
+        "timings": {
+            "files": len(filenames),
+            "failed": sum(1 for result in results if "error" in result),
+            "parseSeconds": parsed_at - started,
+            "authenticitySeconds": finished - parsed_at,
+            "totalSeconds": finished - started,
+        },
+    }), 200
+
 if __name__ == "__main__":
+    # Development server with the reloader; run serve.py in production
+    fail_interrupted_jobs()
     app.run(debug=True)
@@ -1,8 +1,16 @@
+import json
+import os
 import re
-from typing import Dict, List, Tuple
-import spacy
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
 from nltk.corpus import stopwords
 import nltk
+import numpy as np
+from nlp_models import pipe
+from metrics import timed
+from skill_evidence import EvidenceIndex
+from settings import COMPANY_CACHE_PATH, COMPANY_CACHE_SIZE
 
 # Download NLTK data (Colab-compatible)
 # try:
@@ -10,18 +18,75 @@ import nltk
 # except LookupError:
 #     nltk.download('stopwords')
 
-# Load SpaCy model (available in Colab)
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("SpaCy model not found. Run: !pip install spacy && python -m spacy download en_core_web_sm")
-    raise
-
 stop_words = set(stopwords.words('english'))
 
+class CompanyVerdictCache:
+    """
+    Process-wide, size-bounded LRU of company verification verdicts.
+    With a ``path`` every new verdict is appended to a JSON-lines file that is
+    reloaded on start-up, so verdicts survive restarts.
+    """
+
+    def __init__(self, max_entries: int = COMPANY_CACHE_SIZE, path: Optional[str] = COMPANY_CACHE_PATH):
+        self.max_entries = max_entries
+        self.path = path or None
+        self.verdicts = OrderedDict()
+        self.lock = threading.Lock()
+        self.appended = 0
+        if self.path and os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        name, verdict = json.loads(line)
+                    except ValueError:
+                        continue  # Skip a line cut short by a crash
+                    self._remember(name, verdict)
+
+    def __contains__(self, company_name: str) -> bool:
+        with self.lock:
+            return company_name in self.verdicts
+
+    def get(self, company_name: str) -> Optional[bool]:
+        with self.lock:
+            verdict = self.verdicts.get(company_name)
+            if verdict is not None:
+                self.verdicts.move_to_end(company_name)
+            return verdict
+
+    def put_many(self, verdicts: Dict[str, bool]) -> None:
+        with self.lock:
+            for name, verdict in verdicts.items():
+                self._remember(name, verdict)
+            if self.path and verdicts:
+                self._persist(verdicts)
+
+    def _remember(self, company_name: str, verdict: bool) -> None:
+        self.verdicts[company_name] = verdict
+        self.verdicts.move_to_end(company_name)
+        while len(self.verdicts) > self.max_entries:
+            self.verdicts.popitem(last=False)
+
+    def _persist(self, verdicts: Dict[str, bool]) -> None:
+        self.appended += len(verdicts)
+        if self.appended > 2 * self.max_entries:
+            # Rewrite the file from memory so it can't grow without bound
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                for name, verdict in self.verdicts.items():
+                    file.write(json.dumps([name, verdict]) + "\n")
+            os.replace(tmp_path, self.path)
+            self.appended = len(self.verdicts)
+        else:
+            with open(self.path, "a", encoding="utf-8") as file:
+                for name, verdict in verdicts.items():
+                    file.write(json.dumps([name, verdict]) + "\n")
+
+
+company_cache = CompanyVerdictCache()
+
 class ResumeAuthenticityChecker:
     def __init__(self):
-        self.company_cache = {}  # Cache for company verification results
+        self.company_cache = company_cache  # Shared by every checker in the process
         self.buzzwords = [
             "game-changer", "disruptive", "leverage", "synergy", "cutting-edge",
             "paradigm", "streamlined", "holistic", "next-gen", "transformative"
@@ -40,35 +105,59 @@ class ResumeAuthenticityChecker:
         Heuristic-based detection of AI-generated content.
         Returns (ai_score, is_suspected_ai, triggered_buzzwords).
         """
-        words = text.lower().split()
-        if not words:
-            return 0.0, False, []
-        
-        # Count buzzwords and track which ones are found
-        buzzword_count = 0
-        triggered_buzzwords = []
-        for word in words:
-            if word in self.buzzwords and word not in triggered_buzzwords:
-                buzzword_count += 1
-                triggered_buzzwords.append(word)
-        
+        return self.detect_ai_content_batch([text])[0]
+
+    def detect_ai_content_batch(self, texts: List[str]) -> List[Tuple[float, bool, List[str]]]:
+        """
+        Scores many texts at once. Each text is split once; buzzword density,
+        sentence-length uniformity and digit presence are then computed as
+        NumPy arrays over the whole batch. Results match detect_ai_content.
+        """
+        buzzwords = frozenset(self.buzzwords)
+        word_counts = np.zeros(len(texts), dtype=np.int64)
+        buzzword_counts = np.zeros(len(texts), dtype=np.int64)
+        has_digits = np.zeros(len(texts), dtype=bool)
+        triggered = []
+        sentence_lengths = []  # Flattened over the batch, sentence_owner says which text each belongs to
+        sentence_owner = []
+
+        for index, text in enumerate(texts):
+            words = text.lower().split()
+            # Track which buzzwords are found, in order of first appearance
+            triggered_buzzwords = list(dict.fromkeys(word for word in words if word in buzzwords))
+            triggered.append(triggered_buzzwords)
+            if not words:
+                continue
+            word_counts[index] = len(words)
+            buzzword_counts[index] = len(triggered_buzzwords)
+            has_digits[index] = any(map(str.isdigit, text))
+            lengths = [length for length in map(len, map(str.split, text.split('.'))) if length]
+            sentence_lengths.extend(lengths)
+            sentence_owner.extend([index] * len(lengths))
+
         # Calculate sentence length uniformity
-        sentence_lengths = [len(sent.split()) for sent in text.split('.') if sent.strip()]
-        avg_sentence_length = sum(sentence_lengths) / len(sentence_lengths) if sentence_lengths else 0
-        sentence_uniformity = (
-            sum(1 for length in sentence_lengths if abs(length - avg_sentence_length) < 3) / 
-            len(sentence_lengths) if sentence_lengths else 0
-        )
-        
+        sentence_lengths = np.asarray(sentence_lengths, dtype=np.float64)
+        sentence_owner = np.asarray(sentence_owner, dtype=np.int64)
+        sentence_counts = np.bincount(sentence_owner, minlength=len(texts))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            avg_sentence_length = np.bincount(sentence_owner, weights=sentence_lengths, minlength=len(texts)) / sentence_counts
+            uniform = np.abs(sentence_lengths - avg_sentence_length[sentence_owner]) < 3
+            sentence_uniformity = np.bincount(sentence_owner, weights=uniform, minlength=len(texts)) / sentence_counts
+            buzzword_density = buzzword_counts / word_counts
+        sentence_uniformity[sentence_counts == 0] = 0.0
+
         # Check for generic phrases (e.g., lack of specific tools or numbers)
-        generic_score = 1.0 if not any(char.isdigit() for char in text) else 0.5
-        
+        generic_score = np.where(has_digits, 0.5, 1.0)
+
         # Combine scores: buzzword density (50%), sentence uniformity (30%), generic phrasing (20%)
-        buzzword_density = buzzword_count / len(words) if words else 0.0
-        ai_score = (buzzword_density * 0.5 + sentence_uniformity * 0.3 + generic_score * 0.2)
-        is_suspected_ai = ai_score > 0.5  # Threshold as requested
-        
-        return ai_score, is_suspected_ai, triggered_buzzwords
+        ai_scores = buzzword_density * 0.5 + sentence_uniformity * 0.3 + generic_score * 0.2
+        ai_scores[word_counts == 0] = 0.0
+        is_suspected_ai = ai_scores > 0.5  # Threshold as requested
+
+        return [
+            (float(ai_score), bool(suspected), triggered_buzzwords)
+            for ai_score, suspected, triggered_buzzwords in zip(ai_scores.tolist(), is_suspected_ai.tolist(), triggered)
+        ]
 
     def verify_company(self, company_name: str) -> bool:
         """
@@ -76,50 +165,74 @@ class ResumeAuthenticityChecker:
         """
         if not company_name:
             return False
-        if company_name in self.company_cache:
-            return self.company_cache[company_name]
-
-        # Check if the name matches a major tech company
-        company_name_lower = company_name.lower()
-        is_major_tech = any(tech_company.lower() in company_name_lower for tech_company in self.major_tech_companies)
-        
-        # Use SpaCy to check if the name is recognized as an organization
-        doc = nlp(company_name)
-        is_org = any(ent.label_ == "ORG" for ent in doc.ents)
-        
-        # Check for common company name endings
+        return self.verify_companies([company_name])[company_name]
+
+    def verify_companies(self, company_names: Iterable[str]) -> Dict[str, bool]:
+        """
+        Verifies many company names at once. Cached verdicts are reused and every
+        name that still needs NER goes through the pipeline in a single pipe call.
+        """
+        verdicts = {}
+        new_verdicts = {}
+        needs_ner = []
         company_patterns = r"(Inc\.|LLC|Corp\.|Corporation| Ltd\.| GmbH| Solutions| Technologies| Systems)$"
-        has_company_pattern = bool(re.search(company_patterns, company_name, re.IGNORECASE))
-        
-        is_valid = is_major_tech or is_org or has_company_pattern
-        self.company_cache[company_name] = is_valid
-        return is_valid
+        for company_name in dict.fromkeys(name for name in company_names if name):
+            cached = self.company_cache.get(company_name)
+            if cached is not None:
+                verdicts[company_name] = cached
+                continue
+
+            # Check if the name matches a major tech company
+            company_name_lower = company_name.lower()
+            is_major_tech = any(tech_company.lower() in company_name_lower for tech_company in self.major_tech_companies)
+
+            # Check for common company name endings
+            has_company_pattern = bool(re.search(company_patterns, company_name, re.IGNORECASE))
+
+            if is_major_tech or has_company_pattern:
+                new_verdicts[company_name] = True
+            else:
+                needs_ner.append(company_name)
+
+        # Use SpaCy to check if the remaining names are recognized as organizations
+        for company_name, doc in zip(needs_ner, pipe(needs_ner, "ner")):
+            new_verdicts[company_name] = any(ent.label_ == "ORG" for ent in doc.ents)
+        self.company_cache.put_many(new_verdicts)
+
+        verdicts.update(new_verdicts)
+        return verdicts
+
+    def skill_evidence(self, skills: List[str], experience: List[Dict], projects: List[Dict]) -> Dict[str, List[Dict]]:
+        """
+        Finds where each claimed skill appears in experience or projects.
+        Returns {skill: [{"section", "entry", "field", "start", "end"}, ...]}.
+        """
+        return EvidenceIndex(experience, projects).support(skills)
 
-    def cross_reference_skills(self, skills: List[str], experience: List[Dict], projects: List[Dict]) -> List[str]:
+    def cross_reference_skills(self, skills: List[str], experience: List[Dict], projects: List[Dict],
+                               evidence: Optional[Dict[str, List[Dict]]] = None) -> List[str]:
         """
         Checks if claimed skills are supported by experience or projects.
         Returns a list of unsupported skills.
         """
-        unsupported_skills = []
-        # Combine experience and project descriptions
-        experience_text = " ".join(
-            [exp.get("details", "") + " " + exp.get("role", "") for exp in experience]
-        ).lower()
-        project_text = " ".join(
-            [proj.get("description", "") + " " + proj.get("title", "") for proj in projects]
-        ).lower()
-        combined_text = experience_text + " " + project_text
+        if evidence is None:
+            evidence = self.skill_evidence(skills, experience, projects)
+        return [skill for skill in skills if not evidence[skill] and skill.lower() not in stop_words]
 
-        for skill in skills:
-            skill_lower = skill.lower()
-            if skill_lower not in combined_text and skill_lower not in stop_words:
-                unsupported_skills.append(skill)
-        return unsupported_skills
+    @staticmethod
+    def ai_detection_text(parsed_resume: Dict) -> str:
+        """Experience and project text that AI-content detection looks at."""
+        return " ".join(
+            [exp.get("details", "") + " " + exp.get("role", "") for exp in parsed_resume.get("experience") or []] +
+            [proj.get("description", "") + " " + proj.get("title", "") for proj in parsed_resume.get("projects") or []]
+        )
 
-    def check_resume_authenticity(self, parsed_resume: Dict) -> Dict:
+    @timed("authenticity")
+    def check_resume_authenticity(self, parsed_resume: Dict,
+                                  ai_content: Optional[Tuple[float, bool, List[str]]] = None) -> Dict:
         """
         Main function to check resume authenticity.
-        Input: Parsed resume as a dict.
+        Input: Parsed resume as a dict, and optionally its precomputed detect_ai_content result.
         Output: Dict with authenticity results.
         """
         result = {
@@ -132,12 +245,9 @@ class ResumeAuthenticityChecker:
         }
 
         # Extract text for AI detection
-        raw_text = " ".join(
-            [exp.get("details", "") + " " + exp.get("role", "") for exp in parsed_resume.get("experience") or []] +
-            [proj.get("description", "") + " " + proj.get("title", "") for proj in parsed_resume.get("projects") or []]
-        )
+        raw_text = self.ai_detection_text(parsed_resume)
         if raw_text:
-            ai_score, is_suspected_ai, triggered_buzzwords = self.detect_ai_content(raw_text)
+            ai_score, is_suspected_ai, triggered_buzzwords = ai_content or self.detect_ai_content(raw_text)
             result["ai_score"] = ai_score
             result["is_suspected_ai"] = is_suspected_ai
             result["triggered_buzzwords"] = triggered_buzzwords
@@ -150,17 +260,20 @@ class ResumeAuthenticityChecker:
         skills = parsed_resume.get("skills") or []
         experience = parsed_resume.get("experience") or []
         projects = parsed_resume.get("projects") or []
-        unsupported_skills = self.cross_reference_skills(skills, experience, projects)
+        evidence = self.skill_evidence(skills, experience, projects)
+        unsupported_skills = self.cross_reference_skills(skills, experience, projects, evidence)
         result["unsupported_skills"] = unsupported_skills
+        result["skill_evidence"] = {skill: found for skill, found in evidence.items() if found}
         if unsupported_skills:
             result["authenticity_flags"].append(
                 f"Skills without supporting experience or projects: {', '.join(unsupported_skills)}"
             )
 
-        # Verify company names
-        for exp in experience:
-            company = exp.get("details", "").split("\n")[0].strip()
-            if company and not self.verify_company(company):
+        # Verify company names, all uncached ones in one NER batch
+        companies = [exp.get("details", "").split("\n")[0].strip() for exp in experience]
+        verdicts = self.verify_companies(companies)
+        for company in companies:
+            if company and not verdicts[company]:
                 result["invalid_companies"].append(company)
                 result["authenticity_flags"].append(f"Invalid or unverifiable company: {company}")
 
@@ -168,4 +281,18 @@ class ResumeAuthenticityChecker:
         total_flags = len(result["authenticity_flags"])
         result["authenticity_score"] = max(0, 100 - (total_flags * 20))
 
-        return result
\ No newline at end of file
+        return result
+
+    def check_resumes_authenticity(self, parsed_resumes: List[Dict]) -> List[Dict]:
+        """
+        Batch version of check_resume_authenticity. AI-content scores are computed
+        for the whole batch in one vectorized pass and company names from every
+        resume are verified up front, so the batch costs at most one NER pipe call.
+        """
+        ai_contents = self.detect_ai_content_batch([self.ai_detection_text(parsed_resume) for parsed_resume in parsed_resumes])
+        self.verify_companies(
+            (exp.get("details", "").split("\n")[0].strip()
+             for parsed_resume in parsed_resumes for exp in parsed_resume.get("experience") or [])
+        )
+        return [self.check_resume_authenticity(parsed_resume, ai_content)
+                for parsed_resume, ai_content in zip(parsed_resumes, ai_contents)]
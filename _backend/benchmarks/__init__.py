@@ -0,0 +1 @@
+"""End-to-end benchmarks for the resume parsing pipeline; run with ``python -m benchmarks.run``."""
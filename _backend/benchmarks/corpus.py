@@ -0,0 +1,113 @@
+"""
+Seeded generators for synthetic resumes and job descriptions.
+
+Resumes follow the section layout syntaxAnalysis expects (contact header,
+PROFILE, ACADEMIC DETAILS, Internship, PROJECTS, TECHNICAL SKILLS,
+CERTIFICATIONS, ACHIEVEMENTS) and can be rendered as text or as PDF bytes.
+"""
+import random
+
+from skill_matcher import predefined_skills
+
+FIRST_NAMES = ["Aarav", "Ananya", "Rohan", "Priya", "Kabir", "Isha", "Vivaan", "Meera", "Arjun", "Sara"]
+LAST_NAMES = ["Sharma", "Verma", "Iyer", "Gupta", "Khan", "Mehta", "Reddy", "Das", "Nair", "Singh"]
+COMPANIES = ["Infosys", "TCS", "Wipro", "Google", "Acme Solutions", "Zeta Technologies", "Nimbus Labs", "Accenture"]
+ROLES = ["Software Development", "Machine Learning", "Web Development", "Data Engineering", "Game Development"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "July", "Aug", "Sep", "Oct", "Nov", "Dec"]
+VERBS = ["Developed", "Built", "Designed", "Optimized", "Implemented", "Engineered", "Led", "Automated"]
+OBJECTS = ["a real-time analytics dashboard", "a REST service", "an image classification pipeline",
+           "a multiplayer game prototype", "a recommendation engine", "an ETL workflow", "a banking application"]
+DETAILS = ["improving latency by {n}%", "serving {n}k daily users", "cutting build time by {n}%",
+           "with {n}% test coverage", "reducing cloud cost by {n}%"]
+BUZZWORDS = ["leverage", "synergy", "cutting-edge", "holistic", "transformative"]
+CERTIFICATES = ["Successfully completed (NDE)v1 administered by EC Council",
+                "Attained AWS Cloud Practitioner certification",
+                "Successfully completed Deep Learning Specialization"]
+ACHIEVEMENTS = ["Finalist, Techgig Code Gladiators Hackathon.",
+                "Secured {n}th rank in TCS CodeVita, a global coding competition."]
+
+SKILLS = sorted(predefined_skills)
+
+
+def _sentence(rng, skills):
+    detail = rng.choice(DETAILS).format(n=rng.randint(5, 95))
+    used = ", ".join(rng.sample(skills, min(len(skills), rng.randint(1, 3))))
+    buzz = f" as a {rng.choice(BUZZWORDS)} initiative" if rng.random() < 0.2 else ""
+    return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {used}, {detail}{buzz}."
+
+
+def generate_resume(rng):
+    """Returns one synthetic resume as plain text."""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    skills = rng.sample(SKILLS, rng.randint(5, 15))
+    start_year = rng.randint(2015, 2022)
+
+    lines = [
+        f"{first} {last}",
+        f"Email-id : {first.lower()}.{last.lower()}{rng.randint(1, 999)}@example.com",
+        f"Mobile No.: 9{rng.randint(100000000, 999999999)},",
+        f"https://www.linkedin.com/in/{first.lower()}-{last.lower()}",
+        f"https://github.com/{first.lower()}{last.lower()}",
+        "PROFILE",
+        f"• I am a Computer Science graduate. {_sentence(rng, skills)}",
+        "ACADEMIC DETAILS",
+        "Year Degree/Exam Institute GPA/Marks(%)",
+        f"Sep, {start_year} - Jun, {start_year + 4} B.Tech in Computer Science Graphic Era University {rng.uniform(6, 10):.2f}/10",
+        f"{start_year - 1} 12th, C.B.S.E Public School {rng.uniform(60, 99):.2f} %",
+        f"{start_year - 3} 10th, C.B.S.E Public School {rng.uniform(60, 99):.2f} %",
+        "Internship",
+    ]
+    for _ in range(rng.randint(1, 3)):
+        lines.append(f"• {rng.choice(ROLES)} Internship ({rng.choice(MONTHS)}, {rng.randint(start_year, 2025)}) : "
+                     f"{rng.choice(COMPANIES)}")
+        lines.extend(_sentence(rng, skills) for _ in range(rng.randint(1, 3)))
+    lines.append("PROJECTS")
+    for _ in range(rng.randint(1, 4)):
+        lines.append(f"• {rng.choice(OBJECTS).split(' ', 1)[1].title()} : {_sentence(rng, skills)}")
+        lines.extend(_sentence(rng, skills) for _ in range(rng.randint(0, 2)))
+    lines.append("TECHNICAL SKILLS")
+    lines.append(f"• Languages : {', '.join(skills[:len(skills) // 2])}")
+    lines.append(f"• Technologies : {', '.join(skills[len(skills) // 2:])}")
+    lines.append("CERTIFICATIONS")
+    lines.extend(f"• {cert}" for cert in rng.sample(CERTIFICATES, rng.randint(1, 2)))
+    lines.append("ACHIEVEMENTS")
+    lines.extend(f"• {achievement.format(n=rng.randint(10, 500))}" for achievement in ACHIEVEMENTS)
+    return "\n".join(lines)
+
+
+def generate_job_description(rng):
+    """Returns one synthetic job description mentioning a handful of vocabulary skills."""
+    skills = rng.sample(SKILLS, rng.randint(3, 10))
+    return (f"We are hiring a {rng.choice(ROLES)} engineer. Requirements: a bachelor degree in computer science "
+            f"and hands-on experience with {', '.join(skills[:-1])} and {skills[-1]}. "
+            f"Experience at companies like {rng.choice(COMPANIES)} is a plus.")
+
+
+def render_pdf(text, lines_per_page=40):
+    """Renders resume text into PDF bytes, one page per ``lines_per_page`` lines."""
+    import fitz  # PyMuPDF
+
+    document = fitz.open()
+    lines = text.split("\n")
+    for start in range(0, len(lines), lines_per_page):
+        page = document.new_page()
+        page.insert_textbox(fitz.Rect(36, 36, page.rect.width - 36, page.rect.height - 36),
+                            "\n".join(lines[start:start + lines_per_page]), fontsize=8)
+    data = document.tobytes()
+    document.close()
+    return data
+
+
+def generate_corpus(size, seed=0, with_pdf=True):
+    """Returns ``size`` (text, pdf bytes or None) resumes; the same seed gives the same corpus."""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        text = generate_resume(rng)
+        corpus.append((text, render_pdf(text) if with_pdf else None))
+    return corpus
+
+
+def generate_job_descriptions(count, seed=0):
+    rng = random.Random(seed + 1)
+    return [generate_job_description(rng) for _ in range(count)]
@@ -0,0 +1,149 @@
+"""
+Times every stage of the pipeline over synthetic corpora and writes the results as JSON.
+
+    python -m benchmarks.run --sizes 1,10,100,1000 --output bench.json
+
+Run from the _backend directory. Each stage is timed per document, so results for
+different corpus sizes and different commits can be compared directly.
+"""
+import argparse
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import redirect_stdout
+
+from benchmarks.corpus import generate_corpus, generate_job_descriptions
+
+# Stages timed end to end, by calling the functions production runs. The per-extractor
+# breakdown ("spacy", "segment_sections", "extract_skills", "job_profile", ...) comes
+# from the metrics.STAGE_SECONDS histograms those functions record themselves.
+STAGES_DOC = ["extract_text_from_pdf", "tokenize_resumes", "analyze_resume", "check_resume_authenticity"]
+
+
+def stage_totals():
+    """{stage: (count, total seconds)} recorded in metrics.STAGE_SECONDS so far."""
+    from metrics import STAGE_SECONDS
+
+    with STAGE_SECONDS.lock:
+        return {key[0]: (sum(data[:-1]), data[-1]) for key, data in STAGE_SECONDS.values.items()}
+
+
+def stage_breakdown(before, after):
+    """Per-stage count, total and mean of what STAGE_SECONDS recorded between two stage_totals() calls."""
+    breakdown = {}
+    for stage, (count, total) in after.items():
+        count -= before.get(stage, (0, 0))[0]
+        total -= before.get(stage, (0, 0))[1]
+        if count:
+            breakdown[stage] = {"count": count, "total_s": total, "mean_ms": 1000 * total / count}
+    return breakdown
+
+
+class StageTimer:
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def time(self, stage, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        self.samples[stage].append(time.perf_counter() - start)
+        return result
+
+    def summary(self):
+        summary = {}
+        for stage, samples in self.samples.items():
+            ordered = sorted(samples)
+            summary[stage] = {
+                "count": len(ordered),
+                "total_s": sum(ordered),
+                "mean_ms": 1000 * sum(ordered) / len(ordered),
+                "p50_ms": 1000 * ordered[len(ordered) // 2],
+                "p95_ms": 1000 * ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+                "max_ms": 1000 * ordered[-1],
+            }
+        return summary
+
+
+def run_corpus(size, seed, with_pdf, profile="fast"):
+    # Imported here so --help works without spaCy/PyMuPDF installed
+    from authenticity_checker import ResumeAuthenticityChecker
+    from calculate_similarity_score import analyze_resume
+    from parsing import tokenize_resumes
+    from pdf_extraction import extract_text_from_pdf
+
+    corpus = generate_corpus(size, seed, with_pdf)
+    job_descriptions = generate_job_descriptions(max(1, size // 100), seed)
+    checker = ResumeAuthenticityChecker()
+    timer = StageTimer()
+
+    before = stage_totals()
+    started = time.perf_counter()
+    for i, (text, pdf_bytes) in enumerate(corpus):
+        if pdf_bytes is not None:
+            text = timer.time("extract_text_from_pdf", extract_text_from_pdf, io.BytesIO(pdf_bytes))
+        # spaCy + parse_resume, without the parse cache or any file output
+        with redirect_stdout(io.StringIO()):  # parse_resume prints what it extracted
+            [parsed] = timer.time("tokenize_resumes", lambda: tokenize_resumes([text], n_process=1, profile=profile))
+
+        timer.time("analyze_resume", analyze_resume, parsed, job_descriptions[i % len(job_descriptions)])
+        timer.time("check_resume_authenticity", checker.check_resume_authenticity, parsed)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "documents": size,
+        "wall_s": elapsed,
+        "docs_per_s": size / elapsed if elapsed else None,
+        "stages": timer.summary(),
+        "breakdown": stage_breakdown(before, stage_totals()),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1,10,100", help="comma-separated corpus sizes (1 to 10000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-pdf", action="store_true", help="skip PDF rendering and extraction")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--profile", default="fast", choices=["fast", "standard", "full"],
+                        help="spaCy parse profile used for tokenization")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    if any(not 1 <= size <= 10000 for size in sizes):
+        parser.error("corpus sizes must be between 1 and 10000")
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "pdf": not args.no_pdf,
+            "profile": args.profile,
+            "timestamp": time.time(),
+        },
+        "results": {},
+    }
+    for size in sizes:
+        report["results"][str(size)] = run_corpus(size, args.seed, not args.no_pdf, args.profile)
+        result = report["results"][str(size)]
+        print(f"{size:>6} resumes: {result['wall_s']:.2f}s ({result['docs_per_s']:.1f} docs/s)")
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=4)
+    print(f"✅ Benchmark results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
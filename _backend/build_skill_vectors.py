@@ -0,0 +1,61 @@
+"""
+Exports word vectors for the skill vocabulary and its aliases from a large
+spaCy model, so scoring gets large-model matching quality without loading that
+model at runtime.
+
+    python build_skill_vectors.py --model en_core_web_lg --output skill_vectors
+
+Run from the _backend directory. Writes <output>.npy (one L2-normalised float32
+row per name) and <output>.json (the row names and the model they came from).
+Aliases get their canonical skill's vector, so they always match it exactly.
+Rebuild whenever predefined_skills or SKILL_ALIASES change.
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+
+from skill_matcher import SKILL_ALIASES, predefined_skills
+
+
+def build(model, output):
+    # Imported here so --help works without spaCy installed
+    from nlp_models import get_nlp
+
+    nlp = get_nlp(model)
+    skills = sorted(predefined_skills)
+    # Static vectors only need the tokenizer; no pipeline component has to run
+    vectors = np.array([nlp.make_doc(skill).vector for skill in skills], dtype=np.float32)
+    norms = np.sqrt(np.einsum("ij,ij->i", vectors, vectors))
+    norms[norms == 0] = 1
+    vectors /= norms[:, np.newaxis]
+
+    row_of = {skill: row for row, skill in enumerate(skills)}
+    aliases = sorted(alias for alias in SKILL_ALIASES if alias not in row_of)
+    names = skills + aliases
+    table = np.concatenate([vectors, vectors[[row_of[SKILL_ALIASES[alias]] for alias in aliases]]])
+
+    # Write to temporary names first so running workers never map a half-written table
+    np.save(output + ".tmp.npy", table)
+    with open(output + ".tmp.json", "w", encoding="utf-8") as file:
+        json.dump({"model": model, "dim": int(table.shape[1]), "names": names}, file, indent=2)
+    os.replace(output + ".tmp.npy", output + ".npy")
+    os.replace(output + ".tmp.json", output + ".json")
+
+    missing = [skill for skill, row in zip(skills, vectors) if not row.any()]
+    print(f"Wrote {len(names)} vectors ({table.shape[1]} dims) from {model} to {output}.npy")
+    if missing:
+        print(f"No vector for: {', '.join(missing)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="en_core_web_lg", help="spaCy model with static word vectors")
+    parser.add_argument("--output", default="skill_vectors", help="output path without extension")
+    args = parser.parse_args(argv)
+    build(args.model, args.output)
+
+
+if __name__ == "__main__":
+    main()
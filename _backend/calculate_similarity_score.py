@@ -1,28 +1,12 @@
-import spacy
 import json
+import threading
+from collections import OrderedDict
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
-
-# Load spaCy model with word vectors
-nlp = spacy.load("en_core_web_sm")  
-
-# Predefined skills dictionary
-predefined_skills = {"Python", "Java", "C++", "C", "JavaScript", "TypeScript", "Go", "Rust", "Swift", "Kotlin",
-    "SQL", "NoSQL", "PostgreSQL", "MySQL", "MongoDB", "Redis", "SQLite", "OracleDB", "GraphQL",
-    "PL/SQL", "Firebase", "Machine Learning", "Deep Learning", "Data Structures", "Algorithms",
-    "Computer Vision", "OpenCV", "TensorFlow", "Keras", "PyTorch", "Scikit-learn", "Pandas",
-    "NumPy", "Matplotlib", "Seaborn", "NLTK", "spaCy", "Hugging Face Transformers", "Flask",
-    "Django", "FastAPI", "Spring Boot", "Express.js", "Node.js", "React", "Next.js", "Angular",
-    "Vue.js", "Svelte", "Bootstrap", "Tailwind CSS", "Material-UI", "jQuery", "Three.js",
-    "WebAssembly", "GraphQL", "REST API", "Microservices", "Docker", "Kubernetes", "Git",
-    "GitHub", "GitLab", "CI/CD", "Jenkins", "Terraform", "Ansible", "AWS", "Azure", "Google Cloud",
-    "Linux", "Shell Scripting", "Bash", "PowerShell", "Operating Systems", "Embedded Systems",
-    "Cybersecurity", "Cryptography", "Blockchain", "Smart Contracts", "Solidity", "Ethereum",
-    "Hyperledger", "Arduino", "Raspberry Pi", "Computer Networks", "Network Security", "DevOps",
-    "Agile", "Scrum", "Data Science", "Big Data", "Hadoop", "Spark", "Kafka", "Airflow",
-    "Natural Language Processing", "Reinforcement Learning", "Generative AI", "LLMs", "AutoML",
-    "Data Engineering", "ETL", "Snowflake", "Data Warehousing", "ELK Stack", "Selenium",
-    "Jest", "Mocha", "Cypress", "Unity", "Unreal Engine", "Blender", "Javascript"}
+from nlp_models import pipe, process
+from skill_matcher import get_skill_matcher, predefined_skills
+from metrics import timed
+from settings import SKILL_VECTOR_CACHE_SIZE, SKILL_VECTORS_PATH
 
 
 def extract_resume_data(parsed_resume):
@@ -35,14 +19,14 @@ def extract_resume_data(parsed_resume):
 
 def extract_job_skills(job_description):
     """Extracts skills from job description based on predefined skills"""
-    job_skills = {skill for skill in predefined_skills if skill.lower() in job_description.lower()}
+    job_skills = set(get_skill_matcher().find_skills(job_description))
     return job_skills
 
 
 def extract_job_education(job_description):
     """Extracts education requirements from job description"""
     edu_keywords = ["bachelor", "master", "phd", "degree", "computer science", "software engineering"]
-    job_education = {token.text for token in nlp(job_description.lower()) if token.text in edu_keywords}
+    job_education = {token.text for token in process(job_description.lower(), "tokenizer") if token.text in edu_keywords}
     return job_education if job_education else {"Not Specified"}
 
 
@@ -51,7 +35,7 @@ def extract_job_education(job_description):
 #     unmatched_skills = []
 
 #     for r_skill in resume_skills:
-#         r_vec = nlp(r_skill).vector
+#         r_vec = process(r_skill, "vectors").vector
 #         if np.linalg.norm(r_vec) == 0:
 #             continue  # Skip skills without valid vectors
 
@@ -59,7 +43,7 @@ def extract_job_education(job_description):
 #         best_score = 0
 
 #         for j_skill in job_skills:
-#             j_vec = nlp(j_skill).vector
+#             j_vec = process(j_skill, "vectors").vector
 #             if np.linalg.norm(j_vec) == 0:
 #                 continue  # Skip invalid vectors
 
@@ -76,33 +60,172 @@ def extract_job_education(job_description):
 #     overall_similarity = round(sum(score for _, score in matched_skills.values()) / max(1, len(resume_skills)), 2)
 #     # print(type(overall_similarity))
 #     return matched_skills, unmatched_skills, overall_similarity
-def compute_similarity(resume_skills, job_skills):
+
+
+_vector_cache = {}  # vocabulary skill -> unit vector (a row of the predefined matrix), kept for good
+_other_vectors = OrderedDict()  # LRU of vectors for any other skill name, at most SKILL_VECTOR_CACHE_SIZE
+_other_vectors_lock = threading.Lock()
+_predefined_matrix = None
+_vector_table = None  # (name -> row, memory-mapped matrix) from build_skill_vectors.py; False if not built
+_vector_table_lock = threading.Lock()
+
+
+def _normalize_rows(matrix):
+    """L2-normalise rows the way sklearn's cosine_similarity does; zero rows stay zero."""
+    norms = np.sqrt(np.einsum("ij,ij->i", matrix, matrix))
+    norms[norms == 0] = 1
+    return matrix / norms[:, np.newaxis]
+
+
+def _load_vector_table():
+    """(row_of, matrix) from SKILL_VECTORS_PATH, or False when it isn't built or doesn't match."""
+    try:
+        with open(SKILL_VECTORS_PATH + ".json", "r", encoding="utf-8") as file:
+            names = json.load(file)["names"]
+        matrix = np.load(SKILL_VECTORS_PATH + ".npy", mmap_mode="r")
+    except FileNotFoundError:
+        return False
+    if len(names) != len(matrix):
+        print(f"Ignoring {SKILL_VECTORS_PATH}.npy: it does not match {SKILL_VECTORS_PATH}.json, rebuild it")
+        return False
+    # Exact names win; lowercased names catch other spellings of the same skill
+    row_of = {name.lower(): row for row, name in reversed(list(enumerate(names)))}
+    row_of.update((name, row) for row, name in enumerate(names))
+    return row_of, matrix
+
+
+def skill_vector_table():
+    """
+    The precomputed (name -> row, matrix) pair from SKILL_VECTORS_PATH, or None when
+    it hasn't been built. The matrix is memory-mapped read-only, so every worker
+    shares the same pages instead of holding its own copy.
+    """
+    global _vector_table
+    if _vector_table is None:
+        with _vector_table_lock:
+            if _vector_table is None:
+                # Published only once fully loaded, so no caller sees a half-built table
+                _vector_table = _load_vector_table()
+    return _vector_table or None
+
+
+def _embed(skills):
+    """Normalised vectors for ``skills`` from the spaCy model."""
+    return _normalize_rows(np.array([doc.vector for doc in pipe(skills, "vectors")]))
+
+
+def _table_rows(row_of, skills):
+    """Table row of each skill, matched exactly or case-insensitively; -1 when the table doesn't know it."""
+    return np.array([row_of.get(skill, row_of.get(skill.lower(), -1)) for skill in skills], dtype=np.int64)
+
+
+def predefined_skill_matrix():
+    """
+    Normalised vectors for every entry in predefined_skills. With a precomputed table
+    this is a view of the mapped file, not a copy; otherwise it's embedded once per process.
+    """
+    global _predefined_matrix
+    if _predefined_matrix is None:
+        names = sorted(predefined_skills)
+        table = skill_vector_table()
+        if table is not None:
+            row_of, matrix = table
+            rows = _table_rows(row_of, names)
+            # build_skill_vectors.py writes the vocabulary first, in this order
+            if (rows == np.arange(len(names))).all():
+                _predefined_matrix = matrix[:len(names)]
+            else:
+                _predefined_matrix = _gather(matrix, rows)
+        else:
+            _predefined_matrix = _embed(names)
+            for name, row in zip(names, _predefined_matrix):
+                _vector_cache[name] = row
+    return _predefined_matrix
+
+
+def _gather(matrix, rows):
+    """Rows of the mapped table for one query; unknown skills (-1) get a zero row, i.e. no valid vector."""
+    vectors = matrix[np.maximum(rows, 0)]
+    vectors[rows < 0] = 0
+    return vectors
+
+
+def skill_vectors(skills):
+    """
+    Returns (matrix, valid) with one normalised row per skill, in order.
+    ``valid`` is False for skills the model has no vector for.
+    With a precomputed table the rows are read straight from the shared mapping
+    for each call, so nothing per skill is cached in the process.
+    """
+    table = skill_vector_table()
+    if table is not None:
+        row_of, table_matrix = table
+        matrix = _gather(table_matrix, _table_rows(row_of, skills))
+        return matrix, matrix.any(axis=1)
+
+    predefined_skill_matrix()
+    vectors = {}
+    missing = []
+    with _other_vectors_lock:
+        for skill in dict.fromkeys(skills):
+            vector = _vector_cache.get(skill)
+            if vector is None:
+                vector = _other_vectors.get(skill)
+                if vector is not None:
+                    _other_vectors.move_to_end(skill)
+            if vector is None:
+                missing.append(skill)
+            else:
+                vectors[skill] = vector
+    if missing:
+        embedded = _embed(missing)
+        vectors.update(zip(missing, embedded))
+        with _other_vectors_lock:
+            _other_vectors.update(zip(missing, embedded))
+            while len(_other_vectors) > SKILL_VECTOR_CACHE_SIZE:
+                _other_vectors.popitem(last=False)
+    matrix = np.array([vectors[skill] for skill in skills])
+    return matrix, matrix.any(axis=1)
+
+
+def compute_similarity(resume_skills, job_skills, job_vectors=None):
+    """
+    Matches each resume skill to its most similar job skill.
+    ``job_vectors`` is the (matrix, valid) pair from skill_vectors(job_skills) when
+    the caller already has it, e.g. from a JobProfile.
+    """
     matched_skills = {}
     unmatched_resume_skills = set(resume_skills)  # Keep track of resume skills that don’t match
     unmatched_job_skills = set(job_skills)  # Keep track of job skills missing in resume
 
-    for r_skill in resume_skills:
-        r_vec = nlp(r_skill).vector
-        if np.linalg.norm(r_vec) == 0:
-            continue  # Skip skills without valid vectors
-
-        best_match = None
-        best_score = 0
-
-        for j_skill in job_skills:
-            j_vec = nlp(j_skill).vector
-            if np.linalg.norm(j_vec) == 0:
-                continue  # Skip invalid vectors
-
-            score = cosine_similarity([r_vec], [j_vec])[0][0]
-
-            if score > best_score:
-                best_match, best_score = j_skill, score
-
-        if best_score >= 0.95:  # Adjust threshold if necessary
-            matched_skills[r_skill] = (best_match, round(best_score, 2))
-            unmatched_resume_skills.discard(r_skill)  # Remove matched resume skills
-            unmatched_job_skills.discard(best_match)  # Remove matched job skills
+    resume_skills = list(resume_skills)
+    job_skills = list(job_skills)
+    if resume_skills and job_skills:
+        r_matrix, r_valid = skill_vectors(resume_skills)
+        j_matrix, j_valid = job_vectors if job_vectors is not None else skill_vectors(job_skills)
+
+        # Cosine similarity of every resume skill against every job skill in one product
+        scores = r_matrix @ j_matrix.T
+        scores[:, ~j_valid] = 0  # Skip job skills without valid vectors
+        # The same skill on both sides always matches, even when no vector is known for it
+        job_column = {skill: j for j, skill in reversed(list(enumerate(job_skills)))}
+        exact = [job_column.get(r_skill) for r_skill in resume_skills]
+        for i, j in enumerate(exact):
+            if j is not None:
+                scores[i, j] = 1.0
+        best_indices = scores.argmax(axis=1)  # First best match wins ties, as in the pairwise loop
+
+        for i, r_skill in enumerate(resume_skills):
+            if not r_valid[i] and exact[i] is None:
+                continue  # Skip skills without valid vectors
+
+            best_match = job_skills[best_indices[i]]
+            best_score = scores[i, best_indices[i]]
+
+            if best_score >= 0.95:  # Adjust threshold if necessary
+                matched_skills[r_skill] = (best_match, round(best_score, 2))
+                unmatched_resume_skills.discard(r_skill)  # Remove matched resume skills
+                unmatched_job_skills.discard(best_match)  # Remove matched job skills
 
     # Update unmatched skills to include job skills missing from the resume
     unmatched_skills = {
@@ -129,10 +252,10 @@ def compare_education(resume_education, job_education):
     best_score = 0
 
     for r_edu in resume_education:
-        r_vec = nlp(r_edu).vector.reshape(1, -1)
+        r_vec = process(r_edu, "vectors").vector.reshape(1, -1)
 
         for j_edu in job_education:
-            j_vec = nlp(j_edu).vector.reshape(1, -1)
+            j_vec = process(j_edu, "vectors").vector.reshape(1, -1)
             score = cosine_similarity(r_vec, j_vec)[0][0]
 
             if score > best_score:
@@ -141,31 +264,50 @@ def compare_education(resume_education, job_education):
     return matched_education if best_score >= 0.7 else None, round(best_score, 2)
 
 
+class JobProfile:
+    """
+    A job description compiled once: its skills, their normalised vectors and its
+    education requirements. Scoring a resume against it only costs that resume's skills.
+    """
+
+    @timed("job_profile")
+    def __init__(self, job_description):
+        self.job_description = job_description
+        self.skills = list(extract_job_skills(job_description))
+        self.vectors = skill_vectors(self.skills) if self.skills else None
+        self.education = extract_job_education(job_description)
+
+    def score(self, parsed_resume):
+        return self.score_skills(extract_resume_data(parsed_resume))
+
+    @timed("similarity")
+    def score_skills(self, resume_skills):
+        matched_skills, unmatched_skills, skills_similarity = compute_similarity(resume_skills, self.skills, self.vectors)
+        # matched_education, education_similarity = compare_education(resume_education, job_education)
+
+        # Convert numpy.float32 values to Python float
+        skills_similarity = float(skills_similarity)
+        # print(type(skills_similarity))
+        # education_similarity = float(education_similarity)
+
+        # final_similarity_score = round(((skills_similarity + education_similarity) / 2) * 100, 2)
+
+        # return (
+        #     {key: (value[0], float(value[1])) for key, value in matched_skills.items()},  # Convert skill scores
+        #     unmatched_skills,
+        #     matched_education,
+        #     job_education,
+        #     float(final_similarity_score)  # Ensure final score is a Python float
+        # )
+        return {
+            "matchedSkills": {key: (value[0], float(value[1])) for key, value in matched_skills.items()},  # Convert skill scores
+            "unmatchedSkills": unmatched_skills,
+            "similarityScore": round(skills_similarity * 100, 2)  # Convert to percentage
+        }
+
+
 def analyze_resume(parsed_resume, job_description):
-    
-    resume_skills = extract_resume_data(parsed_resume)
-    job_skills = extract_job_skills(job_description)
-    # job_education = extract_job_education(job_description)
-
-    matched_skills, unmatched_skills, skills_similarity = compute_similarity(resume_skills, job_skills)
-    # matched_education, education_similarity = compare_education(resume_education, job_education)
-
-    # Convert numpy.float32 values to Python float
-    skills_similarity = float(skills_similarity)
-    # print(type(skills_similarity))
-    # education_similarity = float(education_similarity)
-
-    # final_similarity_score = round(((skills_similarity + education_similarity) / 2) * 100, 2)
-
-    # return (
-    #     {key: (value[0], float(value[1])) for key, value in matched_skills.items()},  # Convert skill scores
-    #     unmatched_skills,
-    #     matched_education,
-    #     job_education,
-    #     float(final_similarity_score)  # Ensure final score is a Python float
-    # )
-    return {
-        "matchedSkills": {key: (value[0], float(value[1])) for key, value in matched_skills.items()},  # Convert skill scores
-        "unmatchedSkills": unmatched_skills,
-        "similarityScore": round(skills_similarity * 100, 2)  # Convert to percentage
-    }
\ No newline at end of file
+    """Scores a parsed resume against a job description text or a prebuilt JobProfile."""
+    if not isinstance(job_description, JobProfile):
+        job_description = JobProfile(job_description)
+    return job_description.score(parsed_resume)
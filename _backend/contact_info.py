@@ -0,0 +1,64 @@
+"""
+Single-pass contact-info extraction.
+
+Name, email, phone and links are pulled out of the header tokens together.
+Every pattern is compiled once at import, the tokens are walked once, and each
+result carries its character offsets into the header text (the tokens joined
+with single spaces, the same text extract_name has always searched).
+"""
+import re
+
+from metrics import timed
+
+EMAIL_RE = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+PHONE_RE = re.compile(r"\b(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b")
+
+# Common patterns for name extraction, tried in order
+NAME_PATTERNS = [
+    re.compile(r"Extracted\s*Text\s*:\s*(\w+\s+\w+)", re.IGNORECASE),  # Extracted Text: First Last
+    re.compile(r"^([\w]+\s[\w]+)(?=\s*Email|Email\-id|Mobile)", re.IGNORECASE),  # Name before Email
+    re.compile(r"([\w]+\s[\w]+)(?=\s*B\.\s?Tech|Bachelors|M\.Tech|Masters|Degree)", re.IGNORECASE),  # Name before education
+]
+
+
+def _field(value, start):
+    return {"value": value, "start": start, "end": start + len(value)}
+
+
+def find_name(text):
+    """First name-pattern match in ``text`` as a field dict, or None."""
+    for pattern in NAME_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            name = match.group(1).strip()
+            return _field(name, match.start(1) + match.group(1).index(name))
+    return None
+
+
+@timed("extract_contact_info")
+def extract_contact_info(tokens):
+    """
+    Scans the header tokens once and returns
+    {"name", "email", "phone": {"value", "start", "end"} or None, "links": [...]}.
+    Email and phone are the first tokens matching their pattern; links are every
+    token starting with "http". Offsets index into " ".join(tokens).
+    """
+    email = None
+    phone = None
+    links = []
+    offset = 0
+    for token in tokens:
+        if email is None and "@" in token and EMAIL_RE.match(token):
+            email = _field(token, offset)
+        if phone is None and PHONE_RE.match(token):
+            phone = _field(token, offset)
+        if token.startswith("http"):
+            links.append(_field(token, offset))
+        offset += len(token) + 1
+
+    return {
+        "name": find_name(" ".join(tokens)),
+        "email": email,
+        "phone": phone,
+        "links": links,
+    }
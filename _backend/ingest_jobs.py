@@ -0,0 +1,226 @@
+"""
+Background ingestion of resume batches.
+
+An upload is saved to a job directory and queued; the request returns a job id
+straight away while worker threads extract, parse and store the files, updating
+per-file progress that clients poll. Jobs refer to their files by path and all
+state changes go through JobStore, which writes them through to the resume store,
+so a poll can be answered by any server process, not just the one running the job.
+"""
+import os
+import queue
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from pdf_extraction import SpooledPdf, save_pdf
+from resume_store import resume_store
+from settings import INGEST_CHUNK_SIZE, INGEST_DIR, INGEST_JOB_RETENTION, INGEST_WORKERS
+from skill_index import get_skill_index
+from worker_pool import parse_pdfs
+
+QUEUED = "queued"
+PROCESSING = "processing"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobStore:
+    """
+    Thread-safe job records. Jobs this process runs are kept in memory and every
+    change is written through to ``store``, where any other process can read them.
+    Finished jobs beyond ``retention`` are forgotten.
+    """
+
+    def __init__(self, retention=INGEST_JOB_RETENTION, store=resume_store):
+        self.jobs = OrderedDict()
+        self.retention = retention
+        self.store = store
+        self.lock = threading.Lock()
+
+    def create(self, job):
+        with self.lock:
+            self.jobs[job["jobId"]] = job
+            finished = [job_id for job_id, record in self.jobs.items() if record["status"] in (DONE, FAILED)]
+            for job_id in finished[:max(0, len(self.jobs) - self.retention)]:
+                del self.jobs[job_id]
+            self.store.save_job(job)
+            self.store.prune_jobs(self.retention, (DONE, FAILED))
+
+    def get(self, job_id):
+        """A snapshot of the job that is safe to serialise, or None."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is not None:
+                return _snapshot(job)
+        # Started by another process, or already dropped from memory
+        return self.store.load_job(job_id)
+
+    # A job is only ever updated by the thread running it, so its writes can go to
+    # the store after the lock is released without overtaking one another
+
+    def update(self, job_id, **fields):
+        with self.lock:
+            self.jobs[job_id].update(fields)
+            snapshot = _snapshot(self.jobs[job_id])
+        self.store.save_job(snapshot)
+
+    def update_files(self, job_id, updates):
+        """Applies {file index: fields} to the job's files and writes the job once."""
+        with self.lock:
+            job = self.jobs[job_id]
+            for index, fields in updates.items():
+                job["files"][index].update(fields)
+            job["processed"] = sum(1 for entry in job["files"] if entry["status"] in (DONE, FAILED))
+            snapshot = _snapshot(job)
+        self.store.save_job(snapshot)
+
+    def update_file(self, job_id, index, **fields):
+        self.update_files(job_id, {index: fields})
+
+
+def _snapshot(job):
+    return dict(job, files=[dict(entry) for entry in job["files"]])
+
+
+class IngestQueue:
+    def __init__(self, job_store, workers=INGEST_WORKERS, directory=INGEST_DIR):
+        self.job_store = job_store
+        self.workers = workers
+        self.directory = directory
+        self.queue = queue.Queue()
+        self.threads = []
+        self.lock = threading.Lock()
+
+    def _start(self):
+        # Threads start on first use, never at import, so preforked servers don't inherit them
+        with self.lock:
+            if self.threads:
+                return
+            for _ in range(self.workers):
+                thread = threading.Thread(target=self._work, daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def submit(self, uploads):
+        """
+        Saves (filename, file-like) uploads under a new job directory and queues the job.
+        Returns the job id.
+        """
+        job_id = uuid.uuid4().hex
+        job_dir = os.path.join(self.directory, job_id)
+        os.makedirs(job_dir)
+        files = []
+        try:
+            for i, (filename, upload) in enumerate(uploads):
+                spooled = save_pdf(upload, os.path.join(job_dir, f"{i}.pdf"))
+                files.append({"filename": filename, "path": spooled.source, "size": spooled.size,
+                              "sha256": spooled.sha256, "status": QUEUED})
+        except Exception:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise
+
+        self.job_store.create({"jobId": job_id, "status": QUEUED, "createdAt": time.time(),
+                               "total": len(files), "processed": 0, "files": files, "batchId": None})
+        self._start()
+        self.queue.put(job_id)
+        return job_id
+
+    def _work(self):
+        while True:
+            job_id = self.queue.get()
+            try:
+                process_job(self.job_store, job_id)
+            except Exception as e:
+                # A failing job must not take the worker thread down with it
+                self.job_store.update(job_id, status=FAILED, error=str(e), finishedAt=time.time())
+            finally:
+                shutil.rmtree(os.path.join(self.directory, job_id), ignore_errors=True)
+                self.queue.task_done()
+
+
+def _parse_files(job_store, job_id, indices, files):
+    """Parses a chunk of files; if the chunk fails, retries one by one so one bad PDF only fails itself."""
+    spooled = [SpooledPdf(files[i]["path"], files[i]["size"], files[i]["sha256"]) for i in indices]
+    try:
+        return list(zip(indices, parse_pdfs(spooled)))
+    except Exception:
+        if len(indices) == 1:
+            raise
+
+    parsed = []
+    for i, single in zip(indices, spooled):
+        try:
+            parsed.extend(zip([i], parse_pdfs([single])))
+        except Exception as e:
+            job_store.update_file(job_id, i, status=FAILED, error=str(e))
+    return parsed
+
+
+def process_job(job_store, job_id):
+    """Extracts, parses and stores every file of a queued job, recording progress as it goes."""
+    job = job_store.get(job_id)
+    files = job["files"]
+    batch_id = job_id
+    job_store.update(job_id, status=PROCESSING, startedAt=time.time(), batchId=batch_id)
+    skill_index = get_skill_index()
+
+    for start in range(0, len(files), INGEST_CHUNK_SIZE):
+        indices = list(range(start, min(start + INGEST_CHUNK_SIZE, len(files))))
+        job_store.update_files(job_id, {i: {"status": PROCESSING} for i in indices})
+        try:
+            parsed = _parse_files(job_store, job_id, indices, files)
+        except Exception as e:
+            job_store.update_file(job_id, indices[0], status=FAILED, error=str(e))
+            continue
+
+        if not parsed:
+            continue
+        resume_ids = resume_store.insert_batch(
+            batch_id, [(files[i]["filename"], parsed_resume) for i, (_, parsed_resume) in parsed]
+        )
+        done = {}
+        for resume_id, (i, (_, parsed_resume)) in zip(resume_ids, parsed):
+            skill_index.add(resume_id, parsed_resume.get("skills") or [], files[i]["filename"])
+            done[i] = {"status": DONE, "resumeId": resume_id}
+        job_store.update_files(job_id, done)  # One write per chunk, not one per file
+
+    failed = sum(1 for entry in job_store.get(job_id)["files"] if entry["status"] == FAILED)
+    job_store.update(job_id, status=FAILED if failed == len(files) and files else DONE,
+                     failed=failed, finishedAt=time.time())
+
+
+def fail_interrupted_jobs(store=resume_store, directory=INGEST_DIR):
+    """
+    Marks jobs left queued or processing by a previous server run as failed and
+    removes their files. Their threads died with that run, so nothing would ever
+    finish them. Call once at startup, before any job is submitted.
+    """
+    now = time.time()
+    for job in store.iter_jobs((QUEUED, PROCESSING)):
+        for entry in job["files"]:
+            if entry["status"] not in (DONE, FAILED):
+                entry.update(status=FAILED, error="Interrupted by a server restart")
+        failed = sum(1 for entry in job["files"] if entry["status"] == FAILED)
+        job.update(status=FAILED, error="Interrupted by a server restart", failed=failed,
+                   processed=len(job["files"]), finishedAt=now)
+        store.save_job(job)
+    if os.path.isdir(directory):
+        for name in os.listdir(directory):
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+
+job_store = JobStore()
+ingest_queue = IngestQueue(job_store)
+
+
+def job_status(job_id):
+    """The job as reported to clients: progress and results, without server-side file paths."""
+    job = job_store.get(job_id)
+    if job is None:
+        return None
+    for entry in job["files"]:
+        entry.pop("path", None)
+    return job
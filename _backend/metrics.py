@@ -0,0 +1,206 @@
+"""
+In-process metrics with a Prometheus text exposition.
+
+Pipeline stages are timed with ``timed(stage)`` (a decorator or a context
+manager) into latency histograms; document sizes, errors and HTTP requests are
+recorded alongside. Work done in pool worker processes is captured with
+``capture()`` and replayed into the parent's registry with ``replay()``, so
+/metrics covers it too.
+"""
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (100, 1000, 5000, 10000, 50000, 100000, 500000, 1000000, 5000000, 20000000)
+
+_capture = threading.local()
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+        _record(self.name, labels, amount)
+
+    def samples(self):
+        with self.lock:
+            items = list(self.values.items())
+        for key, value in items:
+            yield self.name + _format_labels(self.labelnames, key), value
+
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.values = {}  # labels -> [per-bucket counts..., +Inf count, sum]
+        self.lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            data = self.values.get(key)
+            if data is None:
+                data = self.values[key] = [0] * (len(self.buckets) + 2)
+            data[index] += 1
+            data[-1] += value
+        _record(self.name, labels, value)
+
+    def samples(self):
+        with self.lock:
+            items = [(key, list(data)) for key, data in self.values.items()]
+        for key, data in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), data[:-1]):
+                cumulative += count
+                yield self.name + "_bucket" + _format_labels(self.labelnames, key, [("le", bound)]), cumulative
+            yield self.name + "_sum" + _format_labels(self.labelnames, key), data[-1]
+            yield self.name + "_count" + _format_labels(self.labelnames, key), cumulative
+
+
+class CallbackMetric:
+    """A metric whose values are read from ``callback`` (returning {label values: value}) at scrape time."""
+
+    def __init__(self, name, help, type, labelnames, callback):
+        self.name = name
+        self.help = help
+        self.type = type
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+
+    def samples(self):
+        for key, value in self.callback().items():
+            yield self.name + _format_labels(self.labelnames, key), value
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+
+    def _add(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help, labelnames=()):
+        return self._add(Counter(name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def callback(self, name, help, type, labelnames, callback):
+        return self._add(CallbackMetric(name, help, type, labelnames, callback))
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(f"{sample} {_format_value(value)}" for sample, value in metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram("resume_stage_seconds", "Latency of pipeline stages.", ["stage"])
+STAGE_ERRORS = REGISTRY.counter("resume_stage_errors_total", "Pipeline stages that raised.", ["stage"])
+DOCUMENT_SIZE = REGISTRY.histogram("resume_document_size", "Size of processed documents.", ["unit"],
+                                   buckets=SIZE_BUCKETS)
+HTTP_REQUESTS = REGISTRY.counter("resume_http_requests_total", "HTTP requests served.", ["endpoint", "status"])
+HTTP_SECONDS = REGISTRY.histogram("resume_http_request_seconds", "HTTP request latency.", ["endpoint"])
+
+
+@contextmanager
+def stage_timer(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+
+
+def timed(stage):
+    """Decorator recording every call of the wrapped function under ``stage``."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _record(name, labels, value):
+    observations = getattr(_capture, "observations", None)
+    if observations is not None:
+        observations.append((name, labels, value))
+
+
+@contextmanager
+def capture():
+    """Collects every observation made in this thread, e.g. inside a pool worker, for replay()."""
+    previous = getattr(_capture, "observations", None)
+    _capture.observations = observations = []
+    try:
+        yield observations
+    finally:
+        _capture.observations = previous
+
+
+def replay(observations):
+    """Records observations captured in another process into this process's registry."""
+    for name, labels, value in observations:
+        metric = REGISTRY.metrics[name]
+        if isinstance(metric, Histogram):
+            metric.observe(value, **labels)
+        else:
+            metric.inc(value, **labels)
+
+
+def timed_iter(stage, iterable):
+    """Yields from ``iterable``, timing how long each item took to produce."""
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        except Exception:
+            STAGE_ERRORS.inc(stage=stage)
+            raise
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+        yield item
@@ -0,0 +1,70 @@
+"""Process-wide registry of spaCy pipelines.
+
+Every module asks this registry for its pipeline instead of calling
+``spacy.load`` at import time, so a worker holds exactly one copy of each
+model and only pays for loading it the first time it is actually used.
+"""
+import threading
+
+import spacy
+
+DEFAULT_MODEL = "en_core_web_sm"
+
+# Pipeline components each kind of caller needs. Everything else is disabled
+# for that call, so e.g. a tokenizer-only caller never runs the tagger, parser
+# or NER. ``None`` means "run the whole pipeline".
+COMPONENTS = {
+    "tokenizer": (),
+    "ner": ("ner",),
+    "vectors": ("tok2vec",),  # en_core_web_sm has no static vectors, .vector comes from the tok2vec tensor
+    "full": None,
+}
+
+_models = {}
+_lock = threading.Lock()
+
+
+def get_nlp(model=DEFAULT_MODEL):
+    """Return the shared pipeline for ``model``, loading it on first use."""
+    nlp = _models.get(model)
+    if nlp is None:
+        with _lock:
+            nlp = _models.get(model)
+            if nlp is None:
+                try:
+                    nlp = spacy.load(model)
+                except OSError:
+                    print(f"SpaCy model not found. Run: pip install spacy && python -m spacy download {model}")
+                    raise
+                _models[model] = nlp
+    return nlp
+
+
+def disabled_components(nlp, needs):
+    """Names of the pipeline components a caller with ``needs`` can skip."""
+    wanted = COMPONENTS[needs]
+    if wanted is None:
+        return []
+    return [name for name in nlp.pipe_names if name not in wanted]
+
+
+def process(text, needs="full", model=DEFAULT_MODEL):
+    """Run ``text`` through the shared pipeline with only the components in ``needs``."""
+    nlp = get_nlp(model)
+    if needs == "tokenizer":
+        return nlp.make_doc(text)
+    return nlp(text, disable=disabled_components(nlp, needs))
+
+
+def pipe(texts, needs="full", model=DEFAULT_MODEL, batch_size=None, n_process=1):
+    """Stream ``texts`` through the shared pipeline in batches, yielding docs in order."""
+    nlp = get_nlp(model)
+    # Tokenizer-only calls go through nlp.pipe too, with every component disabled,
+    # so batch_size and n_process apply to them like to any other
+    return nlp.pipe(texts, batch_size=batch_size, n_process=n_process,
+                    disable=disabled_components(nlp, needs))
+
+
+def loaded_models():
+    """Names of the models loaded so far in this process."""
+    return list(_models)
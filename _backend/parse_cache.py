@@ -0,0 +1,100 @@
+"""
+Content-addressed cache of parsed resumes.
+
+Entries are keyed on a SHA-256 of the uploaded PDF bytes (or of the submitted
+text) plus PARSER_VERSION, so a re-upload of the same resume skips PyMuPDF and
+spaCy entirely. Lookups go to a bounded in-memory LRU first and then to an
+on-disk tier that is shared by every worker process.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from settings import PARSE_CACHE_DIR, PARSE_CACHE_SIZE
+
+# Bump whenever tokenization, parse_resume or create_json output changes
+PARSER_VERSION = "3"
+
+
+def text_digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ParseCache:
+    def __init__(self, max_entries=PARSE_CACHE_SIZE, directory=PARSE_CACHE_DIR):
+        self.max_entries = max_entries
+        self.directory = directory or None
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    def pdf_key(self, sha256, max_pages):
+        # The page cap changes the extracted text, so it is part of the key
+        return f"v{PARSER_VERSION}-pdf-p{max_pages}-{sha256}"
+
+    def text_key(self, text):
+        return f"v{PARSER_VERSION}-text-{text_digest(text)}"
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, key):
+        """Returns the cached entry for ``key`` or None."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.memory_hits += 1
+                return entry
+
+        entry = None
+        if self.directory:
+            try:
+                with open(self._path(key), "r", encoding="utf-8") as file:
+                    entry = json.load(file)
+            except (FileNotFoundError, json.JSONDecodeError):
+                entry = None
+
+        with self.lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, entry)
+        return entry
+
+    def put(self, key, entry):
+        """Stores ``entry`` (a JSON-serialisable dict) in both tiers."""
+        with self.lock:
+            self._remember(key, entry)
+        if self.directory:
+            # Write to a temp file and rename so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(entry, file)
+            os.replace(tmp_path, self._path(key))
+
+    def _remember(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "memoryHits": self.memory_hits,
+                "diskHits": self.disk_hits,
+                "misses": self.misses,
+            }
+
+
+parse_cache = ParseCache()
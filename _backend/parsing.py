@@ -1,15 +1,88 @@
-import spacy
+from nlp_models import pipe, process
 from syntaxAnalysis import parse_resume
+from settings import PARSE_PROFILE, PIPE_BATCH_SIZE, PIPE_N_PROCESS
+from parse_cache import parse_cache
+from validation import save_to_json
+from metrics import DOCUMENT_SIZE, stage_timer, timed_iter
 
-nlp = spacy.load("en_core_web_sm")
+# Pipeline components each parse profile runs (keys of nlp_models.COMPONENTS).
+# parse_resume only reads token.text, and tagger/parser/NER never change the
+# tokenization, so every profile yields the same parsed resume:
+#   fast     - tokenizer only (the model's own rules), nothing else runs
+#   standard - adds NER, for callers that want doc.ents
+#   full     - the whole pipeline
+PARSE_PROFILES = {
+    "fast": "tokenizer",
+    "standard": "ner",
+    "full": "full",
+}
 
-def tokenize_resume(text, filePath):
-    doc = nlp(text)
+def _profile_needs(profile):
+    try:
+        return PARSE_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown parse profile {profile!r}, expected one of {', '.join(PARSE_PROFILES)}") from None
+
+def tokenize_resume(text, filePath, profile=PARSE_PROFILE):
+    doc = process(text, _profile_needs(profile))
     tokens = [token.text for token in doc]
     save_tokens_to_file(tokens)
-    parse_resume(tokens, filePath)
+    parsed = parse_resume(tokens)
+    save_to_json(parsed, filePath)
     return tokens
 
+def json_sink(filePath=None):
+    """Opt-in sink that saves a parsed resume to ``filePath`` (PARSED_RESUME_PATH when None)."""
+    return lambda parsed: save_to_json(parsed, filePath)
+
+def parse_text(text, sinks=(), save_tokens=False, profile=PARSE_PROFILE):
+    """
+    Parses resume text entirely in memory and returns the parsed resume.
+    Each sink is called with the result; ``save_tokens`` also writes tokenized_resume.txt.
+    ``profile`` picks the spaCy components that run (see PARSE_PROFILES).
+    Text that was parsed before is served from the parse cache; only the tokenizer
+    runs again, and only when ``save_tokens`` asks for the tokens file.
+    """
+    key = parse_cache.text_key(text)
+    entry = parse_cache.get(key)
+    if entry is not None:
+        parsed = entry["parsed"]
+        if save_tokens:
+            save_text_tokens(text)
+    else:
+        with stage_timer("spacy"):
+            tokens = [token.text for token in process(text, _profile_needs(profile))]
+        DOCUMENT_SIZE.observe(len(tokens), unit="tokens")
+        if save_tokens:
+            save_tokens_to_file(tokens)
+        parsed = parse_resume(tokens)
+        parse_cache.put(key, {"parsed": parsed})
+
+    for sink in sinks:
+        sink(parsed)
+    return parsed
+
+def tokenize_resumes(texts, batch_size=PIPE_BATCH_SIZE, n_process=PIPE_N_PROCESS, save_tokens=False,
+                     profile=PARSE_PROFILE):
+    """
+    Batch version of tokenize_resume: runs every text through a single nlp.pipe call.
+    Returns the parsed resume of each text, in order, without writing anything but
+    tokenized_resume.txt when ``save_tokens`` is set.
+    """
+    needs = _profile_needs(profile)
+    parsed_resumes = []
+    for doc in timed_iter("spacy", pipe(texts, needs, batch_size=batch_size, n_process=n_process)):
+        tokens = [token.text for token in doc]
+        DOCUMENT_SIZE.observe(len(tokens), unit="tokens")
+        if save_tokens:
+            save_tokens_to_file(tokens)
+        parsed_resumes.append(parse_resume(tokens))
+    return parsed_resumes
+
+def save_text_tokens(text, filename="tokenized_resume.txt"):
+    """Writes the tokens of ``text`` to ``filename``; the tokenizer alone gives the same tokens as any profile."""
+    save_tokens_to_file([token.text for token in process(text, "tokenizer")], filename)
+
 def save_tokens_to_file(tokens, filename="tokenized_resume.txt"):
     """Save tokenized resume data in a structured format with double quotes and commas."""
     with open(filename, "w", encoding="utf-8") as file:
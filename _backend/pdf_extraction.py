@@ -0,0 +1,133 @@
+"""
+Page-by-page text extraction from uploaded PDFs.
+
+Uploads are copied in fixed-size chunks: small files stay in memory, larger ones
+are spooled to a temporary file that PyMuPDF opens from disk, so a big PDF never
+has to be held in memory as one bytes object. Page text is yielded as it is
+extracted and both the upload size and the number of pages read are capped.
+"""
+import hashlib
+import os
+import tempfile
+from contextlib import contextmanager
+
+import fitz  # PyMuPDF for extracting text from PDFs
+
+from metrics import DOCUMENT_SIZE, timed
+from settings import PDF_MAX_BYTES, PDF_MAX_PAGES, PDF_SPOOL_BYTES
+
+CHUNK_SIZE = 64 * 1024
+
+
+class PdfTooLargeError(ValueError):
+    """Raised when an upload is bigger than the configured byte cap."""
+
+
+class SpooledPdf:
+    """
+    An upload copied out of the request: ``source`` is the bytes, or a file path
+    once spooled to disk. ``sha256`` is the hex digest of the uploaded bytes.
+    """
+
+    def __init__(self, source, size, sha256):
+        self.source = source
+        self.size = size
+        self.sha256 = sha256
+
+
+@contextmanager
+def spooled_pdf(pdf_file, max_bytes=PDF_MAX_BYTES, spool_bytes=PDF_SPOOL_BYTES):
+    """Copies a file-like upload into memory or a temp file; the temp file is removed on exit."""
+    buffer = bytearray()
+    spool = None
+    size = 0
+    digest = hashlib.sha256()
+    try:
+        while True:
+            chunk = pdf_file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            digest.update(chunk)
+            if max_bytes and size > max_bytes:
+                raise PdfTooLargeError(f"PDF exceeds the {max_bytes} byte limit")
+            if spool is None and size > spool_bytes:
+                spool = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
+                spool.write(buffer)
+                buffer = None
+            if spool is None:
+                buffer.extend(chunk)
+            else:
+                spool.write(chunk)
+
+        if spool is None:
+            yield SpooledPdf(bytes(buffer), size, digest.hexdigest())
+        else:
+            spool.close()
+            yield SpooledPdf(spool.name, size, digest.hexdigest())
+    finally:
+        if spool is not None:
+            spool.close()
+            os.remove(spool.name)
+
+
+def save_pdf(pdf_file, path, max_bytes=PDF_MAX_BYTES):
+    """Copies a file-like upload to ``path`` in chunks and returns it as a SpooledPdf."""
+    size = 0
+    digest = hashlib.sha256()
+    try:
+        with open(path, "wb") as out:
+            while True:
+                chunk = pdf_file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                digest.update(chunk)
+                if max_bytes and size > max_bytes:
+                    raise PdfTooLargeError(f"PDF exceeds the {max_bytes} byte limit")
+                out.write(chunk)
+    except PdfTooLargeError:
+        os.remove(path)
+        raise
+    return SpooledPdf(path, size, digest.hexdigest())
+
+
+def open_pdf(source):
+    """Opens a PDF from a path or from bytes."""
+    if isinstance(source, str):
+        return fitz.open(source)
+    return fitz.open(stream=source, filetype="pdf")
+
+
+def iter_pdf_source_pages(source, max_pages=PDF_MAX_PAGES):
+    """Yields the text of each page of an already spooled PDF, stopping after ``max_pages``."""
+    pdf_document = open_pdf(source)
+    try:
+        for page_number, page in enumerate(pdf_document):
+            if max_pages and page_number >= max_pages:
+                break
+            yield page.get_text("text")
+    finally:
+        pdf_document.close()
+
+
+def iter_pdf_pages(pdf_file, max_pages=PDF_MAX_PAGES, max_bytes=PDF_MAX_BYTES):
+    """Yields the text of each page of an uploaded file-like PDF."""
+    with spooled_pdf(pdf_file, max_bytes) as spooled:
+        yield from iter_pdf_source_pages(spooled.source, max_pages)
+
+
+@timed("pdf_extraction")
+def extract_text_from_source(source, max_pages=PDF_MAX_PAGES):
+    """Extract text from an already spooled PDF (bytes or a path)."""
+    text = "\n".join(iter_pdf_source_pages(source, max_pages)).strip()
+    DOCUMENT_SIZE.observe(len(text), unit="chars")
+    return text
+
+
+@timed("pdf_extraction")
+def extract_text_from_pdf(pdf_file, max_pages=PDF_MAX_PAGES, max_bytes=PDF_MAX_BYTES):
+    """Extract text from a PDF file."""
+    text = "\n".join(iter_pdf_pages(pdf_file, max_pages, max_bytes)).strip()
+    DOCUMENT_SIZE.observe(len(text), unit="chars")
+    return text
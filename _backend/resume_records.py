@@ -0,0 +1,171 @@
+"""
+Compact in-memory representation of resumes for ranking large pools.
+
+Each resume's skills are one row of a shared uint64 bitset matrix over the
+sorted predefined_skills vocabulary, and the per-resume record is a small
+``__slots__`` object pointing at its row. Exact skill overlap with a job
+description is then a vectorized AND + popcount over the whole matrix.
+"""
+import numpy as np
+
+from skill_matcher import predefined_skills
+
+SKILL_VOCABULARY = tuple(sorted(predefined_skills))
+
+# Popcount of every byte value, for NumPy versions without np.bitwise_count
+_BYTE_POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+
+def popcount_rows(bits):
+    """Number of set bits in each row of a 2-D uint64 array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(bits).sum(axis=1, dtype=np.int64)
+    as_bytes = np.ascontiguousarray(bits).view(np.uint8).reshape(len(bits), -1)
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=1, dtype=np.int64)
+
+
+class ResumeRecord:
+    __slots__ = ("resume_id", "filename", "row", "extra_skills")
+
+    def __init__(self, resume_id, filename, row, extra_skills=()):
+        self.resume_id = resume_id
+        self.filename = filename
+        self.row = row  # Row of the pool's bitset matrix
+        self.extra_skills = extra_skills  # Skills outside the vocabulary, normally empty
+
+
+class ResumePool:
+    """
+    Resumes keyed by id, with their skills held as bitset rows. Not thread-safe;
+    callers such as SkillIndex serialise access with their own lock.
+    """
+
+    def __init__(self, vocabulary=SKILL_VOCABULARY, capacity=1024):
+        self.vocabulary = tuple(vocabulary)
+        self.bit_of = {skill: bit for bit, skill in enumerate(self.vocabulary)}
+        self.words = max(1, (len(self.vocabulary) + 63) // 64)
+        self.bits = np.zeros((capacity, self.words), dtype=np.uint64)
+        self.row_ids = np.full(capacity, -1, dtype=np.int64)  # -1 marks a free row
+        self.records = {}
+        self.extra_ids = {}  # skill outside the vocabulary -> ids of resumes listing it, normally empty
+        self.free_rows = []
+        self.rows_used = 0
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, resume_id):
+        return resume_id in self.records
+
+    def encode(self, skills):
+        """(bitset row, skills outside the vocabulary) for ``skills``."""
+        value = 0
+        extra = []
+        for skill in skills:
+            bit = self.bit_of.get(skill)
+            if bit is None:
+                extra.append(skill)
+            else:
+                value |= 1 << bit
+        row = np.frombuffer(value.to_bytes(self.words * 8, "little"), dtype="<u8").astype(np.uint64)
+        return row, tuple(extra)
+
+    def decode(self, row):
+        """Vocabulary skills set in a bitset row, in vocabulary order."""
+        value = int.from_bytes(row.astype("<u8").tobytes(), "little")
+        skills = []
+        while value:
+            low = value & -value
+            skills.append(self.vocabulary[low.bit_length() - 1])
+            value ^= low
+        return skills
+
+    def add(self, resume_id, skills, filename=None):
+        self.remove(resume_id)
+        row_bits, extra = self.encode(skills)
+        if self.free_rows:
+            row = self.free_rows.pop()
+        else:
+            if self.rows_used == len(self.bits):
+                self._grow()
+            row = self.rows_used
+            self.rows_used += 1
+        self.bits[row] = row_bits
+        self.row_ids[row] = resume_id
+        self.records[resume_id] = ResumeRecord(resume_id, filename, row, extra)
+        for skill in extra:
+            self.extra_ids.setdefault(skill, set()).add(resume_id)
+
+    def remove(self, resume_id):
+        """Drops a resume; returns its skills, or None if it wasn't in the pool."""
+        record = self.records.pop(resume_id, None)
+        if record is None:
+            return None
+        skills = self.decode(self.bits[record.row]) + list(record.extra_skills)
+        self.bits[record.row] = 0
+        self.row_ids[record.row] = -1
+        self.free_rows.append(record.row)
+        for skill in record.extra_skills:
+            ids = self.extra_ids[skill]
+            ids.discard(resume_id)
+            if not ids:
+                del self.extra_ids[skill]
+        return skills
+
+    def get(self, resume_id):
+        """(filename, skills) of a resume, or None if it isn't in the pool."""
+        record = self.records.get(resume_id)
+        if record is None:
+            return None
+        return record.filename, self.decode(self.bits[record.row]) + list(record.extra_skills)
+
+    def ids_with_any(self, skills):
+        """Ids of resumes listing at least one of ``skills``, found with one AND over the whole pool."""
+        job_bits, extra = self.encode(skills)
+        used = self.row_ids[:self.rows_used]
+        hits = (self.bits[:self.rows_used] & job_bits).any(axis=1) & (used >= 0)
+        ids = set(used[hits].tolist())
+        for skill in extra:
+            ids.update(self.extra_ids.get(skill, ()))
+        return ids
+
+    def overlap_counts(self, skills):
+        """(resume ids, number of ``skills`` each resume lists) over the whole pool."""
+        job_bits, _ = self.encode(skills)
+        used = self.row_ids[:self.rows_used]
+        counts = popcount_rows(self.bits[:self.rows_used] & job_bits)
+        live = used >= 0
+        return used[live], counts[live]
+
+    def top_k_overlap(self, skills, k):
+        """
+        Up to ``k`` (resume id, filename, overlapping skills) tuples with the most
+        exact skill overlap, most first and lowest id first on ties. Resumes with
+        no overlap are left out.
+        """
+        resume_ids, counts = self.overlap_counts(skills)
+        hits = counts > 0
+        resume_ids, counts = resume_ids[hits], counts[hits]
+        if k <= 0:
+            return []
+        if k < len(counts):
+            # Only resumes at least as good as the k-th best can make the cut
+            kth = np.partition(counts, len(counts) - k)[len(counts) - k]
+            keep = counts >= kth
+            resume_ids, counts = resume_ids[keep], counts[keep]
+        order = np.lexsort((resume_ids, -counts))[:k]
+
+        job_bits, _ = self.encode(skills)
+        results = []
+        for resume_id in resume_ids[order].tolist():
+            record = self.records[resume_id]
+            results.append((resume_id, record.filename, self.decode(self.bits[record.row] & job_bits)))
+        return results
+
+    def _grow(self):
+        capacity = len(self.bits) * 2
+        bits = np.zeros((capacity, self.words), dtype=np.uint64)
+        bits[:len(self.bits)] = self.bits
+        row_ids = np.full(capacity, -1, dtype=np.int64)
+        row_ids[:len(self.row_ids)] = self.row_ids
+        self.bits, self.row_ids = bits, row_ids
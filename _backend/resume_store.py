@@ -0,0 +1,207 @@
+"""
+Persistent store of parsed resumes, backed by SQLite.
+
+Each upload batch is written in one transaction. Skills are normalised into
+their own indexed tables, so ranking reads (id, filename, skill) rows straight
+from an index instead of listing a folder and decoding every JSON file.
+"""
+import itertools
+import json
+import sqlite3
+import threading
+import time
+import uuid
+
+from settings import RESUME_DB_PATH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    batch_id TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_resumes_batch ON resumes (batch_id, id);
+
+CREATE TABLE IF NOT EXISTS skills (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS resume_skills (
+    resume_id INTEGER NOT NULL REFERENCES resumes (id) ON DELETE CASCADE,
+    skill_id INTEGER NOT NULL REFERENCES skills (id),
+    PRIMARY KEY (resume_id, skill_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_resume_skills_skill ON resume_skills (skill_id, resume_id);
+
+-- Tombstones, so every server process can drop deleted resumes from its skill index
+CREATE TABLE IF NOT EXISTS resume_deletions (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    resume_id INTEGER NOT NULL
+);
+
+-- Background ingestion jobs, readable from any server process
+CREATE TABLE IF NOT EXISTS ingest_jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ingest_jobs_created ON ingest_jobs (created_at);
+"""
+
+
+def new_batch_id():
+    return uuid.uuid4().hex
+
+
+class ResumeStore:
+    def __init__(self, path=RESUME_DB_PATH):
+        self.path = path
+        self.local = threading.local()  # sqlite3 connections can't be shared across threads
+        self._connect().executescript(SCHEMA)
+
+    def _connect(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA foreign_keys = ON")
+            self.local.connection = connection
+        return connection
+
+    def close(self):
+        """Closes this thread's connection; the next call opens a fresh one. Call before forking."""
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
+
+    def _skill_ids(self, connection, names):
+        connection.executemany("INSERT OR IGNORE INTO skills (name) VALUES (?)", [(name,) for name in names])
+        ids = {}
+        names = list(names)
+        for i in range(0, len(names), 500):  # stay under SQLite's bound-parameter limit
+            chunk = names[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            ids.update(connection.execute(f"SELECT name, id FROM skills WHERE name IN ({placeholders})", chunk))
+        return ids
+
+    def insert_batch(self, batch_id, resumes):
+        """
+        Bulk-inserts (filename, parsed resume) pairs under ``batch_id`` in one transaction.
+        Returns the new resume ids, in order.
+        """
+        connection = self._connect()
+        now = time.time()
+        with connection:
+            ids = []
+            for filename, parsed in resumes:
+                cursor = connection.execute(
+                    "INSERT INTO resumes (batch_id, filename, data, created_at) VALUES (?, ?, ?, ?)",
+                    (batch_id, filename, json.dumps(parsed), now),
+                )
+                ids.append(cursor.lastrowid)
+
+            all_skills = {skill for _, parsed in resumes for skill in parsed.get("skills") or []}
+            skill_ids = self._skill_ids(connection, all_skills)
+            connection.executemany(
+                "INSERT OR IGNORE INTO resume_skills (resume_id, skill_id) VALUES (?, ?)",
+                [(resume_id, skill_ids[skill])
+                 for resume_id, (_, parsed) in zip(ids, resumes)
+                 for skill in set(parsed.get("skills") or [])],
+            )
+        return ids
+
+    def get_resume(self, resume_id):
+        """The parsed resume stored under ``resume_id``, or None."""
+        row = self._connect().execute("SELECT data FROM resumes WHERE id = ?", (resume_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def batch_resumes(self, batch_id):
+        """(id, filename, parsed resume) for every resume in a batch."""
+        rows = self._connect().execute(
+            "SELECT id, filename, data FROM resumes WHERE batch_id = ? ORDER BY id", (batch_id,)
+        )
+        return [(resume_id, filename, json.loads(data)) for resume_id, filename, data in rows]
+
+    def latest_batch_id(self):
+        row = self._connect().execute("SELECT batch_id FROM resumes ORDER BY id DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def iter_resume_skills(self, batch_id=None, after_id=0):
+        """
+        Yields (id, filename, skills) without decoding the stored JSON.
+        Covers one batch, or every stored resume when ``batch_id`` is None;
+        ``after_id`` skips resumes up to and including that id.
+        """
+        query = """
+            SELECT r.id, r.filename, s.name
+            FROM resumes r
+            LEFT JOIN resume_skills rs ON rs.resume_id = r.id
+            LEFT JOIN skills s ON s.id = rs.skill_id
+        """
+        query += " WHERE r.id > ?"
+        params = (after_id,)
+        if batch_id is not None:
+            query += " AND r.batch_id = ?"
+            params += (batch_id,)
+        rows = self._connect().execute(query + " ORDER BY r.id", params)
+        for (resume_id, filename), group in itertools.groupby(rows, key=lambda row: (row[0], row[1])):
+            yield resume_id, filename, [skill for _, _, skill in group if skill is not None]
+
+    def delete_resume(self, resume_id):
+        """Removes a resume and its skill rows; returns False if it didn't exist."""
+        connection = self._connect()
+        with connection:
+            cursor = connection.execute("DELETE FROM resumes WHERE id = ?", (resume_id,))
+            if cursor.rowcount > 0:
+                connection.execute("INSERT INTO resume_deletions (resume_id) VALUES (?)", (resume_id,))
+        return cursor.rowcount > 0
+
+    def iter_deletions(self, after_seq=0):
+        """Yields (seq, resume id) for every deletion recorded after ``after_seq``."""
+        yield from self._connect().execute(
+            "SELECT seq, resume_id FROM resume_deletions WHERE seq > ? ORDER BY seq", (after_seq,)
+        )
+
+    def save_job(self, job):
+        """Inserts or replaces an ingestion job record (a JSON-serialisable dict with jobId, status, createdAt)."""
+        connection = self._connect()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO ingest_jobs (id, status, created_at, record) VALUES (?, ?, ?, ?)",
+                (job["jobId"], job["status"], job["createdAt"], json.dumps(job)),
+            )
+
+    def load_job(self, job_id):
+        row = self._connect().execute("SELECT record FROM ingest_jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter_jobs(self, statuses):
+        """Yields the records of every job in ``statuses``, oldest first."""
+        placeholders = ",".join("?" * len(statuses))
+        rows = self._connect().execute(
+            f"SELECT record FROM ingest_jobs WHERE status IN ({placeholders}) ORDER BY created_at", tuple(statuses)
+        ).fetchall()
+        for (record,) in rows:
+            yield json.loads(record)
+
+    def prune_jobs(self, retention, statuses):
+        """Deletes the oldest jobs in ``statuses`` so at most ``retention`` jobs remain."""
+        connection = self._connect()
+        placeholders = ",".join("?" * len(statuses))
+        with connection:
+            connection.execute(
+                f"""DELETE FROM ingest_jobs WHERE id IN (
+                        SELECT id FROM ingest_jobs WHERE status IN ({placeholders})
+                        ORDER BY created_at
+                        LIMIT max(0, (SELECT count(*) FROM ingest_jobs) - ?)
+                    )""",
+                (*statuses, retention),
+            )
+
+
+resume_store = ResumeStore()
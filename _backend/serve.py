@@ -0,0 +1,116 @@
+"""
+Production entry point: serves the Flask app with gunicorn.
+
+    python serve.py --workers 4 --threads 8
+
+Run from the _backend directory. Models, skill tables and caches are loaded
+once in the parent process, then the workers are forked from it, so the
+read-only pages (spaCy weights, vector tables, the skill index) are shared
+copy-on-write instead of being loaded again by every worker.
+Every option defaults to its RESUME_SERVER_* setting.
+
+Each worker parses a batch of PDFs with its own pool of --parse-workers
+processes, started on its first batch, so one large upload is spread over
+several cores. By default the CPUs are divided among the workers; with one
+worker per CPU that leaves a single process, which parses inside the worker
+itself. For bulk uploads run fewer workers or raise --parse-workers, e.g.
+
+    python serve.py --workers 2 --threads 8 --parse-workers 4
+
+Ingestion job state and resume deletions live in the shared SQLite store, so
+any worker can answer a job poll and every worker's skill index drops deleted
+resumes on its next refresh. Metrics are kept per worker, so /metrics reports
+the worker that answered. Ingest jobs run on threads inside the workers, so
+workers are not recycled by default, and jobs left unfinished by a previous
+run are marked failed at startup.
+"""
+import argparse
+import gc
+import os
+
+from settings import (SERVER_BIND, SERVER_MAX_REQUEST_BYTES, SERVER_MAX_REQUESTS, SERVER_MAX_REQUESTS_JITTER,
+                      SERVER_PARSE_WORKERS, SERVER_THREADS, SERVER_TIMEOUT, SERVER_WORKERS)
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:
+    print("gunicorn not found. Run: pip install gunicorn")
+    raise
+
+
+def preload(parse_workers):
+    """Imports the app and warms everything workers would otherwise load on their own."""
+    from app import app
+    from calculate_similarity_score import predefined_skill_matrix
+    from ingest_jobs import fail_interrupted_jobs
+    from nlp_models import get_nlp
+    from resume_store import resume_store
+    from skill_index import get_skill_index
+    from skill_matcher import get_skill_matcher
+    from worker_pool import set_default_workers
+
+    set_default_workers(parse_workers)
+    # Ingest jobs run on worker threads; any left unfinished died with the last server
+    fail_interrupted_jobs()
+    get_nlp()
+    get_skill_matcher()
+    predefined_skill_matrix()
+    get_skill_index()
+    # SQLite connections must not cross a fork; workers open their own
+    resume_store.close()
+
+    # Move everything loaded so far out of the collector's reach, so collections
+    # in the workers don't touch (and un-share) these pages
+    gc.collect()
+    gc.freeze()
+    return app
+
+
+class ResumeServer(BaseApplication):
+    def __init__(self, app, options):
+        self.application = app
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        return self.application
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bind", default=SERVER_BIND)
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS)
+    parser.add_argument("--threads", type=int, default=SERVER_THREADS, help="request threads per worker")
+    parser.add_argument("--timeout", type=int, default=SERVER_TIMEOUT)
+    parser.add_argument("--max-requests", type=int, default=SERVER_MAX_REQUESTS,
+                        help="restart a worker after this many requests (0 = never); "
+                             "a restart kills the ingest jobs the worker is running")
+    parser.add_argument("--max-requests-jitter", type=int, default=SERVER_MAX_REQUESTS_JITTER)
+    parser.add_argument("--parse-workers", type=int, default=SERVER_PARSE_WORKERS,
+                        help="PDF parsing processes per worker (0 = the CPUs divided among the workers)")
+    parser.add_argument("--max-request-bytes", type=int, default=SERVER_MAX_REQUEST_BYTES,
+                        help="largest accepted request body")
+    args = parser.parse_args(argv)
+
+    parse_workers = args.parse_workers or (os.cpu_count() or 1) // max(1, args.workers)
+    app = preload(parse_workers)
+    app.config["MAX_CONTENT_LENGTH"] = args.max_request_bytes
+
+    ResumeServer(app, {
+        "bind": args.bind,
+        "workers": args.workers,
+        "threads": args.threads,
+        "worker_class": "gthread" if args.threads > 1 else "sync",
+        "timeout": args.timeout,
+        "max_requests": args.max_requests,
+        "max_requests_jitter": args.max_requests_jitter,
+        "preload_app": True,
+    }).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Runtime knobs for the backend, overridable through environment variables."""
+import os
+
+
+def _int_env(name, default):
+    return int(os.environ.get(name, default))
+
+
+# nlp.pipe batching used when many resumes are parsed together
+PIPE_BATCH_SIZE = _int_env("RESUME_PIPE_BATCH_SIZE", 32)
+PIPE_N_PROCESS = _int_env("RESUME_PIPE_N_PROCESS", 1)
+
+# spaCy profile used to tokenize resumes: "fast", "standard" or "full" (see parsing.PARSE_PROFILES)
+PARSE_PROFILE = os.environ.get("RESUME_PARSE_PROFILE", "fast")
+
+# PDF extraction limits
+PDF_SPOOL_BYTES = _int_env("RESUME_PDF_SPOOL_BYTES", 2 * 1024 * 1024)  # larger uploads are spooled to disk
+PDF_MAX_BYTES = _int_env("RESUME_PDF_MAX_BYTES", 20 * 1024 * 1024)
+PDF_MAX_PAGES = _int_env("RESUME_PDF_MAX_PAGES", 20)
+
+# Worker processes used to extract and parse uploaded PDFs (1 = parse in the request process)
+PARSE_WORKERS = _int_env("RESUME_PARSE_WORKERS", os.cpu_count() or 1)
+
+# Parse cache: in-memory LRU entries, backed by a directory of JSON files ("" disables the disk tier)
+PARSE_CACHE_SIZE = _int_env("RESUME_PARSE_CACHE_SIZE", 512)
+PARSE_CACHE_DIR = os.environ.get("RESUME_PARSE_CACHE_DIR", "parse_cache")
+
+# SQLite database holding parsed resumes for ranking
+RESUME_DB_PATH = os.environ.get("RESUME_DB_PATH", "resumes.db")
+
+# Background ingestion of uploaded batches
+INGEST_DIR = os.environ.get("RESUME_INGEST_DIR", "ingest_jobs")
+INGEST_WORKERS = _int_env("RESUME_INGEST_WORKERS", 1)
+INGEST_CHUNK_SIZE = _int_env("RESUME_INGEST_CHUNK_SIZE", 16)  # files parsed between progress updates
+INGEST_JOB_RETENTION = _int_env("RESUME_INGEST_JOB_RETENTION", 1000)  # finished jobs kept for polling
+
+# Process-wide company verification cache; set a path to persist verdicts across restarts
+COMPANY_CACHE_SIZE = _int_env("RESUME_COMPANY_CACHE_SIZE", 10000)
+COMPANY_CACHE_PATH = os.environ.get("RESUME_COMPANY_CACHE_PATH", "")
+
+# Precomputed skill vectors written by build_skill_vectors.py (<path>.npy + <path>.json).
+# When present, scoring memory-maps them instead of embedding skills with the spaCy model.
+SKILL_VECTORS_PATH = os.environ.get("RESUME_SKILL_VECTORS_PATH", "skill_vectors")
+
+# Production server (serve.py); each worker is a forked copy of a preloaded parent
+SERVER_BIND = os.environ.get("RESUME_SERVER_BIND", "0.0.0.0:5000")
+SERVER_WORKERS = _int_env("RESUME_SERVER_WORKERS", os.cpu_count() or 1)
+SERVER_THREADS = _int_env("RESUME_SERVER_THREADS", 4)  # request threads per worker
+SERVER_TIMEOUT = _int_env("RESUME_SERVER_TIMEOUT", 120)  # seconds before a stuck worker is restarted
+SERVER_MAX_REQUESTS = _int_env("RESUME_SERVER_MAX_REQUESTS", 0)  # recycle workers after this many requests (0 = never); recycling kills running ingest jobs
+SERVER_MAX_REQUESTS_JITTER = _int_env("RESUME_SERVER_MAX_REQUESTS_JITTER", 100)
+SERVER_PARSE_WORKERS = _int_env("RESUME_SERVER_PARSE_WORKERS", 0)  # parse processes per server worker (0 = share the CPUs)
+SERVER_MAX_REQUEST_BYTES = _int_env("RESUME_SERVER_MAX_REQUEST_BYTES", 100 * 1024 * 1024)  # whole request body, all uploads together
+
+# Vectors kept for skill names outside the vocabulary (clients can send any names, so this is bounded)
+SKILL_VECTOR_CACHE_SIZE = _int_env("RESUME_SKILL_VECTOR_CACHE_SIZE", 4096)
@@ -0,0 +1,65 @@
+"""
+Term index over a resume's experience and project text, used to find where
+each claimed skill is backed up.
+
+The text is tokenized once with the skill matcher's tokenizer, so a skill only
+counts as supported when all of its tokens appear as whole, consecutive tokens
+("c" no longer matches inside "docker"). Each skill is then answered from the
+postings of its first token, so the cost grows with text length plus skill
+count rather than their product.
+"""
+from collections import defaultdict
+
+from skill_matcher import tokenize_for_matching
+
+# Fields searched for evidence, per resume section
+EVIDENCE_FIELDS = {
+    "experience": ("details", "role"),
+    "projects": ("description", "title"),
+}
+
+
+class EvidenceIndex:
+    def __init__(self, experience, projects):
+        self.sources = []  # (section, entry index, field, [(token, start, end)])
+        self.postings = defaultdict(list)  # token -> [(source index, token position)]
+        entries = {"experience": experience or [], "projects": projects or []}
+        for section, fields in EVIDENCE_FIELDS.items():
+            for entry_index, entry in enumerate(entries[section]):
+                for field in fields:
+                    tokens = list(tokenize_for_matching(entry.get(field) or ""))
+                    if not tokens:
+                        continue
+                    source = len(self.sources)
+                    self.sources.append((section, entry_index, field, tokens))
+                    for position, (token, _, _) in enumerate(tokens):
+                        self.postings[token].append((source, position))
+
+    def find(self, skill):
+        """
+        Every place ``skill`` occurs as a whole token sequence, as dicts with the
+        section, entry index and field it was found in and its start/end offsets
+        into that field's text.
+        """
+        skill_tokens = [token for token, _, _ in tokenize_for_matching(skill)]
+        if not skill_tokens:
+            return []
+        evidence = []
+        for source, position in self.postings.get(skill_tokens[0], ()):
+            section, entry_index, field, tokens = self.sources[source]
+            end = position + len(skill_tokens)
+            if end > len(tokens):
+                continue
+            if all(tokens[position + k][0] == skill_tokens[k] for k in range(1, len(skill_tokens))):
+                evidence.append({
+                    "section": section,
+                    "entry": entry_index,
+                    "field": field,
+                    "start": tokens[position][1],
+                    "end": tokens[end - 1][2],
+                })
+        return evidence
+
+    def support(self, skills):
+        """Maps every skill to its evidence list (empty when unsupported)."""
+        return {skill: self.find(skill) for skill in dict.fromkeys(skills)}
@@ -0,0 +1,108 @@
+"""
+Index of stored resumes by skill.
+
+Retrieval only scores resumes that share at least one matching skill with the
+job description, so ranking cost follows the number of matching candidates
+rather than the size of the pool. Resumes can be added and removed one at a time.
+Each resume's skills are kept as a bitset row of a ResumePool; finding the
+candidates and exact skill-overlap ranking are both vectorized passes over it.
+"""
+import heapq
+import threading
+
+from calculate_similarity_score import skill_vectors
+from resume_records import ResumePool
+from resume_store import resume_store
+
+MATCH_THRESHOLD = 0.95  # Same cut-off compute_similarity uses for a skill match
+
+
+class SkillIndex:
+    def __init__(self):
+        self.pool = ResumePool()  # resume id -> filename and skill bitset
+        self.refreshed_id = 0  # highest store id read by refresh(); ids added locally don't move it
+        self.deletion_seq = 0  # last store tombstone applied by refresh()
+        self.lock = threading.RLock()
+        self.refresh_lock = threading.Lock()  # one refresh at a time, so store changes apply in order
+
+    def add(self, resume_id, skills, filename=None):
+        with self.lock:
+            self.remove(resume_id)
+            self.pool.add(resume_id, frozenset(skills), filename)
+
+    def remove(self, resume_id):
+        with self.lock:
+            return self.pool.remove(resume_id) is not None
+
+    def refresh(self, store=resume_store):
+        """Picks up resumes other processes stored, and drops ones they deleted, since the last refresh."""
+        # Without the lock, a slower refresh could re-add a resume another one already removed
+        with self.refresh_lock:
+            # Resumes this process added itself are read again; add() replaces them in place
+            for resume_id, filename, skills in store.iter_resume_skills(after_id=self.refreshed_id):
+                self.add(resume_id, skills, filename)
+                self.refreshed_id = max(self.refreshed_id, resume_id)
+            for seq, resume_id in store.iter_deletions(after_seq=self.deletion_seq):
+                self.remove(resume_id)
+                self.deletion_seq = seq
+
+    def candidates(self, job_profile):
+        """Ids of resumes with at least one skill that compute_similarity would match to the JD."""
+        with self.lock:
+            if not self.pool or not job_profile.skills:
+                return set()
+            keys = list(self.pool.vocabulary) + list(self.pool.extra_ids)
+
+        # A resume skill matches when it is a JD skill, or close enough to one with a vector
+        key_matrix, key_valid = skill_vectors(keys)
+        j_matrix, j_valid = job_profile.vectors
+        scores = key_matrix @ j_matrix[j_valid].T
+        matching = key_valid & (scores >= MATCH_THRESHOLD).any(axis=1)
+        job_skills = set(job_profile.skills)
+        matching |= [key in job_skills for key in keys]
+
+        with self.lock:
+            return self.pool.ids_with_any([key for key, hit in zip(keys, matching) if hit])
+
+    def top_k(self, job_profile, k):
+        """
+        Returns up to ``k`` (resume id, filename, analyze_resume result) tuples,
+        best similarity score first.
+        """
+        return heapq.nlargest(k, self._score_candidates(job_profile),
+                               key=lambda item: (item[2]["similarityScore"], -item[0]))
+
+    def top_k_exact(self, job_profile, k):
+        """
+        Returns up to ``k`` (resume id, filename, JD skills the resume lists) tuples,
+        most exact skill matches first. No vectors are involved, so this is the
+        cheap bulk alternative to top_k.
+        """
+        with self.lock:
+            return self.pool.top_k_overlap(job_profile.skills, k)
+
+    def _score_candidates(self, job_profile):
+        # A generator, so nlargest only ever holds k scored resumes
+        for resume_id in self.candidates(job_profile):
+            with self.lock:
+                entry = self.pool.get(resume_id)
+            if entry is None:
+                continue  # removed while we were scoring
+            filename, skills = entry
+            yield resume_id, filename, job_profile.score_skills(set(skills))
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_skill_index():
+    """The process-wide index, loaded from the resume store on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                index = SkillIndex()
+                index.refresh()
+                _index = index
+    return _index
@@ -0,0 +1,120 @@
+"""
+Compiled phrase matcher for the skill vocabulary.
+
+The vocabulary is compiled once into a token trie, so finding every skill in a
+resume or job description is a single left-to-right pass over its tokens no
+matter how many skills there are. Multi-word skills ("machine learning",
+"spring boot") match as phrases and matches respect token boundaries, so "c"
+no longer fires inside every word.
+"""
+import re
+
+# Skill vocabulary shared by resume and job description extraction
+predefined_skills = {"Python", "Java", "C++", "C", "JavaScript", "TypeScript", "Go", "Rust", "Swift", "Kotlin",
+    "SQL", "NoSQL", "PostgreSQL", "MySQL", "MongoDB", "Redis", "SQLite", "OracleDB", "GraphQL",
+    "PL/SQL", "Firebase", "Machine Learning", "Deep Learning", "Data Structures", "Algorithms",
+    "Computer Vision", "OpenCV", "TensorFlow", "Keras", "PyTorch", "Scikit-learn", "Pandas",
+    "NumPy", "Matplotlib", "Seaborn", "NLTK", "spaCy", "Hugging Face Transformers", "Flask",
+    "Django", "FastAPI", "Spring Boot", "Express.js", "Node.js", "React", "Next.js", "Angular",
+    "Vue.js", "Svelte", "Bootstrap", "Tailwind CSS", "Material-UI", "jQuery", "Three.js",
+    "WebAssembly", "GraphQL", "REST API", "Microservices", "Docker", "Kubernetes", "Git",
+    "GitHub", "GitLab", "CI/CD", "Jenkins", "Terraform", "Ansible", "AWS", "Azure", "Google Cloud",
+    "Linux", "Shell Scripting", "Bash", "PowerShell", "Operating Systems", "Embedded Systems",
+    "Cybersecurity", "Cryptography", "Blockchain", "Smart Contracts", "Solidity", "Ethereum",
+    "Hyperledger", "Arduino", "Raspberry Pi", "Computer Networks", "Network Security", "DevOps",
+    "Agile", "Scrum", "Data Science", "Big Data", "Hadoop", "Spark", "Kafka", "Airflow",
+    "Natural Language Processing", "Reinforcement Learning", "Generative AI", "LLMs", "AutoML",
+    "Data Engineering", "ETL", "Snowflake", "Data Warehousing", "ELK Stack", "Selenium",
+    "Jest", "Mocha", "Cypress", "Unity", "Unreal Engine", "Blender", "Javascript"}
+
+# Other spellings of vocabulary skills; the matcher reports them under the canonical name
+SKILL_ALIASES = {
+    "JS": "JavaScript", "ReactJS": "React", "React.js": "React", "NodeJS": "Node.js", "ExpressJS": "Express.js",
+    "VueJS": "Vue.js", "NextJS": "Next.js", "Golang": "Go", "Postgres": "PostgreSQL", "Mongo": "MongoDB",
+    "Sklearn": "Scikit-learn", "Scikit Learn": "Scikit-learn", "K8s": "Kubernetes", "GCP": "Google Cloud",
+    "Amazon Web Services": "AWS", "Microsoft Azure": "Azure", "ML": "Machine Learning", "DL": "Deep Learning",
+    "NLP": "Natural Language Processing", "LLM": "LLMs", "GenAI": "Generative AI", "Gen AI": "Generative AI",
+    "Tailwind": "Tailwind CSS", "MUI": "Material-UI", "Hugging Face": "Hugging Face Transformers",
+    "RESTful API": "REST API", "REST APIs": "REST API",
+}
+
+# Words are runs of word characters plus "+"/"#" (so "c++" and "c#" stay whole);
+# every other non-space character is a token of its own ("node . js", "ci / cd").
+_TOKEN_RE = re.compile(r"[\w+#]+|[^\s\w+#]")
+_END = object()  # Trie key marking the end of a skill phrase
+_CASED = object()  # Trie key for phrases that only match as written: {original tokens: skill}
+
+
+def tokenize_for_matching(text):
+    """Yields (lowercased token, start, end) for every matchable token in ``text``."""
+    for match in _TOKEN_RE.finditer(text):
+        yield match.group().lower(), match.start(), match.end()
+
+
+class SkillMatcher:
+    def __init__(self, skills, aliases=None):
+        self.trie = {}
+        # sorted() keeps the canonical spelling deterministic when two entries
+        # only differ in case ("JavaScript" / "Javascript")
+        for skill in sorted(skills):
+            self._insert(skill, skill)
+        # Aliases go in last so they never shadow a vocabulary spelling. All-caps
+        # acronyms only match in capitals, so "5 ml of" is not Machine Learning
+        for alias, skill in sorted((aliases or {}).items()):
+            self._insert(alias, skill, cased=alias.isupper())
+
+    def _insert(self, phrase, skill, cased=False):
+        node = self.trie
+        for token, _, _ in tokenize_for_matching(phrase):
+            node = node.setdefault(token, {})
+        if cased:
+            written = tuple(match.group() for match in _TOKEN_RE.finditer(phrase))
+            node.setdefault(_CASED, {}).setdefault(written, skill)
+        else:
+            node.setdefault(_END, skill)
+
+    def find(self, text):
+        """
+        Returns (skill, start, end) for every skill phrase in ``text``, in order.
+        Matches are leftmost-longest and never overlap.
+        """
+        tokens = list(tokenize_for_matching(text))
+        matches = []
+        i = 0
+        n = len(tokens)
+        while i < n:
+            node = self.trie
+            best = None
+            j = i
+            while j < n and tokens[j][0] in node:
+                node = node[tokens[j][0]]
+                j += 1
+                if _END in node:
+                    best = (node[_END], j)
+                elif _CASED in node:
+                    written = tuple(text[start:end] for _, start, end in tokens[i:j])
+                    skill = node[_CASED].get(written)
+                    if skill is not None:
+                        best = (skill, j)
+            if best:
+                skill, j = best
+                matches.append((skill, tokens[i][1], tokens[j - 1][2]))
+                i = j
+            else:
+                i += 1
+        return matches
+
+    def find_skills(self, text):
+        """Canonical names of the skills found in ``text``, in document order."""
+        return [skill for skill, _, _ in self.find(text)]
+
+
+_matcher = None
+
+
+def get_skill_matcher():
+    """The matcher for predefined_skills and SKILL_ALIASES, compiled on first use."""
+    global _matcher
+    if _matcher is None:
+        _matcher = SkillMatcher(predefined_skills, SKILL_ALIASES)
+    return _matcher
@@ -1,51 +1,106 @@
 import re
-import spacy
-from validation import create_json
+from validation import create_json, save_to_json
+from skill_matcher import get_skill_matcher
+from metrics import timed
+from contact_info import extract_contact_info, find_name
 
-nlp = spacy.load("en_core_web_sm")
 TECH_WORDS = {"C++", "Java", "Python", "HTML", "CSS", "JavaScript", "MySQL", "Git", "Mar"}
 
+# Heading lines (lowercased) and the section each one opens
+SECTION_HEADERS = {
+    "profile": "profile", "summary": "profile", "professional summary": "profile",
+    "objective": "profile", "career objective": "profile", "about me": "profile",
+    "education": "education", "academic details": "education", "academic qualifications": "education",
+    "educational qualifications": "education", "qualifications": "education",
+    "experience": "experience", "work experience": "experience", "professional experience": "experience",
+    "internship": "experience", "internships": "experience", "employment": "experience",
+    "employment history": "experience", "work history": "experience",
+    "projects": "projects", "personal projects": "projects", "academic projects": "projects",
+    "key projects": "projects",
+    "skills": "skills", "technical skills": "skills", "key skills": "skills", "core skills": "skills",
+    "certifications": "certifications", "certification": "certifications", "certificates": "certifications",
+    "licenses & certifications": "certifications",
+    "achievements": "achievements", "awards": "achievements", "honors": "achievements",
+    "honours": "achievements", "accomplishments": "achievements",
+    "positions of responsibility": "responsibilities", "leadership": "responsibilities",
+    "extracurricular activities": "activities", "hobbies": "activities",
+}
+MAX_HEADER_TOKENS = 4
+
+
+@timed("segment_sections")
+def segment_sections(tokens):
+    """
+    Walks the tokens once and returns {section: [(start, end), ...]} token spans.
+    A section starts at a line that consists only of a known heading and runs until
+    the next heading; "header" is everything before the first one (name, contact details).
+    Returns an empty dict when the document has no recognisable headings.
+    """
+    sections = {}
+    current, start = "header", 0
+    line_start = 0
+    n = len(tokens)
 
-def extract_name(tokens):
-    """Extracts the name from tokenized resume text."""
-    text = " ".join(tokens)
+    for i in range(n + 1):
+        if i < n and "\n" not in tokens[i]:
+            continue
+        # Only short lines can be headings, so longer ones are never joined
+        if i - line_start <= 2 * MAX_HEADER_TOKENS + 2:
+            words = [t for t in tokens[line_start:i] if not t.isspace()]
+            if words and words[-1] == ":":
+                words.pop()
+            section = SECTION_HEADERS.get(" ".join(words).lower()) if len(words) <= MAX_HEADER_TOKENS else None
+            if section:
+                if line_start > start:
+                    sections.setdefault(current, []).append((start, line_start))
+                current, start = section, line_start
+        line_start = i + 1
+
+    if current == "header":
+        return {}
+    sections.setdefault(current, []).append((start, n))
+    return sections
 
-    # Debug: Print first few tokens
-    # print("\n🔹 Debug: First 50 Tokens:\n", tokens[:50])
 
-    # Common patterns for name extraction
-    possible_patterns = [
-        r"Extracted\s*Text\s*:\s*(\w+\s+\w+)",  # Extracted Text: First Last
-        r"^([\w]+\s[\w]+)(?=\s*Email|Email\-id|Mobile)",  # Name before Email
-        r"([\w]+\s[\w]+)(?=\s*B\.\s?Tech|Bachelors|M\.Tech|Masters|Degree)",  # Name before education
-    ]
+def section_tokens(tokens, sections, *names):
+    """
+    Tokens of the named sections, in document order.
+    Without any sections (unstructured text) the whole document is returned.
+    """
+    if not sections:
+        return tokens
+    spans = sorted(span for name in names for span in sections.get(name, []))
+    if len(spans) == 1:
+        start, end = spans[0]
+        return tokens[start:end]
+    return [token for start, end in spans for token in tokens[start:end]]
 
-    for pattern in possible_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            name = match.group(1).strip()
-            # print("\n✅ Extracted Name:", name)
-            return name
 
-    # print("\n❌ Name Not Found")
-    return None
+
+@timed("extract_name")
+def extract_name(tokens):
+    """Extracts the name from tokenized resume text."""
+    name = find_name(" ".join(tokens))
+    return name["value"] if name else None
 
 
+# Thin wrappers kept for callers that only want one field; parse_resume uses
+# extract_contact_info to get all of them in one pass.
+@timed("extract_email")
 def extract_email(tokens):
-    for token in tokens:
-        if re.match(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", token):
-            return token
-    return None
+    email = extract_contact_info(tokens)["email"]
+    return email["value"] if email else None
 
+@timed("extract_phone")
 def extract_phone(tokens):
-    for token in tokens:
-        if re.match(r"\b(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b", token):
-            return token
-    return None
+    phone = extract_contact_info(tokens)["phone"]
+    return phone["value"] if phone else None
 
+@timed("extract_links")
 def extract_links(tokens):
-    return [token for token in tokens if token.startswith("http")]
+    return [link["value"] for link in extract_contact_info(tokens)["links"]]
 
+@timed("extract_education")
 def extract_education(tokens):
     edu_keywords = ["B.Tech", "M.Tech", "Bachelor", "Master", "Ph.D", "Diploma", "12th", "10th"]
     education = []
@@ -55,27 +110,10 @@ def extract_education(tokens):
             education.append(edu_entry)
     return education
 
+@timed("extract_skills")
 def extract_skills(tokens):
-    predefined_skills = {
-        "python", "java", "c++", "c", "javascript", "typescript", "go", "rust", "swift", "kotlin",
-        "sql", "nosql", "postgresql", "mysql", "mongodb", "redis", "sqlite", "oracledb", "graphql", 
-        "pl/sql", "firebase", "machine learning", "deep learning", "data structures", "algorithms", 
-        "computer vision", "opencv", "tensorflow", "keras", "pytorch", "scikit-learn", "pandas", 
-        "numpy", "matplotlib", "seaborn", "nltk", "spacy", "hugging face transformers", "flask", 
-        "django", "fastapi", "spring boot", "express.js", "node.js", "react", "next.js", "angular", 
-        "vue.js", "svelte", "bootstrap", "tailwind css", "material-ui", "jquery", "three.js", 
-        "webassembly", "graphql", "rest api", "microservices", "docker", "kubernetes", "git", 
-        "github", "gitlab", "ci/cd", "jenkins", "terraform", "ansible", "aws", "azure", "google cloud", 
-        "linux", "shell scripting", "bash", "powershell", "operating systems", "embedded systems", 
-        "cybersecurity", "cryptography", "blockchain", "smart contracts", "solidity", "ethereum", 
-        "hyperledger", "arduino", "raspberry pi", "computer networks", "network security", "devops", 
-        "agile", "scrum", "data science", "big data", "hadoop", "spark", "kafka", "airflow", 
-        "natural language processing", "reinforcement learning", "generative ai", "llms", "automl", 
-        "data engineering", "etl", "snowflake", "data warehousing", "elk stack", "selenium", 
-        "jest", "mocha", "cypress", "unity", "unreal engine", "blender"
-    }
-
-    return [token for token in tokens if token.lower() in predefined_skills]
+    """Finds every vocabulary skill, including multi-word ones, in a single pass over the text."""
+    return get_skill_matcher().find_skills(" ".join(tokens))
 
 # def extract_experience(tokens):
 #     exp_keywords = ["Internship", "Experience", "Employment", "Job", "Work"]
@@ -93,8 +131,8 @@ def extract_experience_sections(tokens):
                    'TECHNICAL SKILLS', 'CERTIFICATIONS', 'ACHIEVEMENTS', 'POSITIONS OF RESPONSIBILITY']
     exp_keywords = ["Internship", "Experience", "Employment", "Job", "Work"]
 
-    all_headers_lower = [h.lower() for h in all_headers]
-    exp_keywords_lower = [k.lower() for k in exp_keywords]
+    all_headers_lower = {h.lower() for h in all_headers}
+    exp_keywords_lower = {k.lower() for k in exp_keywords}
 
     sections = []
     i = 0
@@ -123,6 +161,7 @@ def extract_experience_sections(tokens):
     return sections
 
 
+@timed("parse_experience")
 def parse_experience(tokens):
     sections = extract_experience_sections(tokens)
     if not sections:
@@ -166,6 +205,7 @@ def parse_experience(tokens):
     return parsed_experience
 
 
+@timed("extract_projects")
 def extract_projects(tokens):
     """Extract project details from tokenized resume text."""
     text = " ".join(tokens)
@@ -196,6 +236,7 @@ def extract_projects(tokens):
 
 
 
+@timed("extract_certifications")
 def extract_certifications(tokens):
     """Extract certifications based on keywords."""
     text = " ".join(tokens)
@@ -207,23 +248,33 @@ def extract_certifications(tokens):
     return None
 
 # Extract Information from Tokenized Data
-def parse_resume(tokens, filePath):
+def parse_resume(tokens, filePath=None):
+    # Split the document into sections once; every extractor only sees its own span
+    sections = segment_sections(tokens)
+    header = section_tokens(tokens, sections, "header") or tokens
+    skills = section_tokens(tokens, sections, "skills") or tokens
+
+    contact = extract_contact_info(header)
+
     parsed_data = {
-        "Name": extract_name(tokens),
-        "Email": extract_email(tokens),
-        "Phone": extract_phone(tokens),
-        "Links": extract_links(tokens),
-        "Education": extract_education(tokens),
-        "Skills": extract_skills(tokens),
-        "Experience": parse_experience(tokens),
-        "Projects": extract_projects(tokens),
-        "Certifications": extract_certifications(tokens)
+        "Name": contact["name"]["value"] if contact["name"] else None,
+        "Email": contact["email"]["value"] if contact["email"] else None,
+        "Phone": contact["phone"]["value"] if contact["phone"] else None,
+        "Links": [link["value"] for link in contact["links"]],
+        "Education": extract_education(section_tokens(tokens, sections, "education")),
+        "Skills": extract_skills(skills),
+        "Experience": parse_experience(section_tokens(tokens, sections, "experience")),
+        "Projects": extract_projects(section_tokens(tokens, sections, "projects")),
+        "Certifications": extract_certifications(section_tokens(tokens, sections, "certifications", "achievements"))
     }
 
     # Display Results
     for key, value in parsed_data.items():
         print(f"{key}: {value}\n")
 
-    create_json(parsed_data, filePath)
+    final_data = create_json(parsed_data)
+    if filePath is not None:
+        save_to_json(final_data, filePath)
+    return final_data
 
 
@@ -1,10 +1,7 @@
 import json
 import re
-import spacy
 from fuzzywuzzy import process
 
-nlp = spacy.load("en_core_web_sm")
-
 # Predefined Skills & Degrees for validation
 TECH_SKILLS = {"Python", "Java", "C++", "C", "Git", "OpenCV", "Machine Learning", "Deep Learning", "SQL", "React"}
 DEGREES = {"B.Tech", "M.Tech", "B.Sc", "M.Sc", "PhD", "MBA", "BCA", "MCA"}
@@ -49,7 +46,7 @@ def clean_experience(exp_list):
     return structured_exp
 
 # Function to generate structured JSON
-def create_json(parsed_data, filePath):
+def create_json(parsed_data):
     certifications, achievements = clean_certifications(parsed_data["Certifications"])
     
     final_data = {
@@ -65,15 +62,17 @@ def create_json(parsed_data, filePath):
         "achievements": achievements
     }
     # print(final_data)
-    save_to_json(final_data, filePath)
+    return final_data
 
 import os
 
+# Where single-resume submissions are saved and served from
+PARSED_RESUME_PATH = r"F:\React JS\ai_resume_parsing_system\_backend\resume_parsed_data.json"
+
 def save_to_json(data, filename=None):
     # Default filename
     if filename is None:
-        full_path = r"F:\React JS\ai_resume_parsing_system\_backend\resume_parsed_data.json"
-        with open(full_path, "w", encoding="utf-8") as file:
+        with open(PARSED_RESUME_PATH, "w", encoding="utf-8") as file:
             json.dump(data, file, indent=4)
     else:
         # Extract only the filename, ignoring any directory paths
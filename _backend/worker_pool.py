@@ -0,0 +1,143 @@
+"""
+Process pool that extracts and parses many PDFs in parallel.
+
+Each worker loads the spaCy models once, in its initializer, and then handles
+chunks of PDFs: PyMuPDF extraction followed by one nlp.pipe pass and
+parse_resume for every document in the chunk. Results come back in the order
+the PDFs were submitted. PDFs already in the parse cache never reach a worker.
+"""
+import math
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from nlp_models import get_nlp
+from parse_cache import parse_cache
+from parsing import save_text_tokens, tokenize_resumes
+from metrics import DOCUMENT_SIZE, capture, replay
+from pdf_extraction import extract_text_from_source
+from settings import PARSE_WORKERS, PDF_MAX_PAGES, PIPE_BATCH_SIZE, PIPE_N_PROCESS
+
+_pool = None
+_pool_lock = threading.Lock()
+_default_workers = PARSE_WORKERS
+
+
+def _init_worker():
+    get_nlp()  # Load the models once per worker, not once per task
+
+
+def _parse_chunk(sources, save_tokens=False, batch_size=PIPE_BATCH_SIZE, n_process=1):
+    """Extracts and parses a list of PDF sources; returns (text, parsed) pairs."""
+    texts = [extract_text_from_source(source) for source in sources]
+    parsed_resumes = tokenize_resumes(texts, batch_size=batch_size, n_process=n_process, save_tokens=save_tokens)
+    return list(zip(texts, parsed_resumes))
+
+
+def _parse_chunk_in_worker(sources):
+    """_parse_chunk for pool workers: also returns the metrics it recorded, for the parent to replay."""
+    # Pool workers are daemonic and can't start spaCy processes of their own
+    with capture() as observations:
+        results = _parse_chunk(sources)
+    return results, observations
+
+
+def set_default_workers(workers):
+    """Sets how many processes parse_pdfs uses when the caller doesn't say. Call before the pool starts."""
+    global _default_workers
+    _default_workers = max(1, workers)
+
+
+def _start_method():
+    # Forking a process that runs request threads can copy a lock some other thread
+    # holds; a fork server starts workers from a clean single-threaded process instead
+    return "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else None
+
+
+def get_pool(workers=None):
+    """The process-wide worker pool, started on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=workers or _default_workers, initializer=_init_worker,
+                                            mp_context=multiprocessing.get_context(_start_method()))
+    return _pool
+
+
+def _discard_pool(pool):
+    """Drops ``pool`` if it is still the process-wide pool, so the next get_pool() starts a new one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+def _chunks(jobs, workers, batch_size):
+    # Small enough to spread the work over every worker, big enough to batch nlp.pipe
+    size = max(1, min(batch_size, math.ceil(len(jobs) / workers)))
+    return [jobs[i:i + size] for i in range(0, len(jobs), size)]
+
+
+def _map_chunks(chunks, workers):
+    """Parses ``chunks`` on the pool; if a worker died and broke the pool, retries once on a new one."""
+    pool = get_pool(workers)
+    try:
+        return list(pool.map(_parse_chunk_in_worker, chunks))
+    except BrokenProcessPool:
+        # A broken executor refuses all further work, so it has to be replaced
+        _discard_pool(pool)
+        return list(get_pool(workers).map(_parse_chunk_in_worker, chunks))
+
+
+def parse_pdfs(spooled_pdfs, sinks=(), workers=None, batch_size=PIPE_BATCH_SIZE, save_tokens=False):
+    """
+    Extracts and parses every SpooledPdf in memory, reusing cached results for PDFs seen before.
+    Returns (extracted text, parsed resume) pairs in submission order. Each sink is called
+    with every parsed resume; ``save_tokens`` writes tokenized_resume.txt for fresh parses.
+    ``workers`` defaults to RESUME_PARSE_WORKERS, or what set_default_workers() chose.
+    """
+    if workers is None:
+        workers = _default_workers
+    results = [None] * len(spooled_pdfs)
+    keys = [parse_cache.pdf_key(spooled.sha256, PDF_MAX_PAGES) for spooled in spooled_pdfs]
+    misses = []
+    for i, key in enumerate(keys):
+        entry = parse_cache.get(key)
+        if entry is not None:
+            results[i] = (entry["text"], entry["parsed"])
+            if save_tokens:
+                save_text_tokens(entry["text"])  # The tokens file must match this upload, not the last fresh parse
+        else:
+            misses.append(i)
+
+    if misses:
+        sources = [spooled_pdfs[i].source for i in misses]
+        for i in misses:
+            DOCUMENT_SIZE.observe(spooled_pdfs[i].size, unit="bytes")
+        if workers <= 1:
+            parsed = _parse_chunk(sources, save_tokens, batch_size, PIPE_N_PROCESS)
+        else:
+            parsed = []
+            for parsed_chunk, observations in _map_chunks(_chunks(sources, workers, batch_size), workers):
+                parsed.extend(parsed_chunk)
+                replay(observations)
+
+        for i, (text, parsed_resume) in zip(misses, parsed):
+            parse_cache.put(keys[i], {"text": text, "parsed": parsed_resume})
+            results[i] = (text, parsed_resume)
+
+    for sink in sinks:
+        for _, parsed_resume in results:
+            sink(parsed_resume)
+    return results